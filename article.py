@@ -0,0 +1,147 @@
+import calendar
+import hashlib
+import sys
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+from dedup_index import normalize_url
+
+ARTICLE_COLUMNS = ['title', 'description', 'url', 'published_date', 'source', 'country', 'language']
+
+def article_key(url: str, source: str, title: str) -> str:
+    """
+    Stable identifier of an article, derived from its normalised URL (or
+    from source and title for articles without a link).
+    """
+    normalized = normalize_url(url or '')
+    key = normalized if normalized else f"{source or ''}\x1f{title or ''}"
+    return hashlib.sha1(key.encode('utf-8')).hexdigest()
+
+def article_id(entry: Mapping[str, Any]) -> str:
+    """
+    Stable identifier of an article given as a mapping (e.g. an export row).
+    """
+    return article_key(entry.get('url') or '', entry.get('source', ''), entry.get('title', ''))
+
+def to_epoch(value: datetime) -> int:
+    """
+    Seconds since the epoch of a naive UTC or aware datetime.
+    """
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc)
+    return calendar.timegm(value.timetuple())
+
+def from_epoch(timestamp: int) -> datetime:
+    """
+    Naive UTC datetime of an epoch timestamp.
+    """
+    return datetime.fromtimestamp(timestamp, timezone.utc).replace(tzinfo=None)
+
+class Article:
+    """
+    Compact record of one collected article.
+
+    Uses ``__slots__`` instead of a per-instance dict, keeps the publication
+    date as integer seconds since the epoch (UTC), and interns the low
+    cardinality fields (source, country, language) so every article of a
+    source shares one string. The ISO ``published_date`` of the exports is
+    only produced when a row is written.
+    """
+
+    __slots__ = ('title', 'description', 'url', 'published', 'source', 'country', 'language')
+
+    def __init__(
+        self,
+        title: str,
+        description: str,
+        url: str,
+        published: int,
+        source: str,
+        country: str,
+        language: str = ''
+    ):
+        self.title = title
+        self.description = description
+        self.url = url
+        self.published = published
+        self.source = sys.intern(source)
+        self.country = sys.intern(country)
+        self.language = sys.intern(language)
+
+    @classmethod
+    def from_row(cls, row: Mapping[str, Any]) -> Optional['Article']:
+        """
+        Build a record from an export row; None if its date is unusable.
+        """
+        from date_parsing import default_parser
+
+        published_date = str(row.get('published_date') or '')
+        try:
+            published = datetime.fromisoformat(published_date)
+        except ValueError:
+            published = default_parser.parse(published_date)
+            if published is None:
+                return None
+        return cls(
+            str(row.get('title') or ''),
+            str(row.get('description') or ''),
+            str(row.get('url') or ''),
+            to_epoch(published),
+            str(row.get('source') or ''),
+            str(row.get('country') or ''),
+            str(row.get('language') or '')
+        )
+
+    @property
+    def published_date(self) -> str:
+        """
+        Publication date as a naive UTC ISO 8601 string, as in the exports.
+        """
+        return from_epoch(self.published).isoformat()
+
+    @property
+    def article_id(self) -> str:
+        return article_key(self.url, self.source, self.title)
+
+    def as_tuple(self) -> Tuple[str, ...]:
+        """
+        Field values in ``ARTICLE_COLUMNS`` order.
+        """
+        return (
+            self.title, self.description, self.url, self.published_date,
+            self.source, self.country, self.language
+        )
+
+    def as_row(self) -> Dict[str, str]:
+        return dict(zip(ARTICLE_COLUMNS, self.as_tuple()))
+
+    def __getstate__(self) -> Tuple[Any, ...]:
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def __setstate__(self, state: Tuple[Any, ...]) -> None:
+        for name, value in zip(self.__slots__, state):
+            setattr(self, name, value)
+        # Interned strings are not interned again after unpickling
+        self.source = sys.intern(self.source)
+        self.country = sys.intern(self.country)
+        self.language = sys.intern(self.language)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Article):
+            return NotImplemented
+        return self.__getstate__() == other.__getstate__()
+
+    def __repr__(self) -> str:
+        return f"Article({self.source!r}, {self.published_date!r}, {self.title!r})"
+
+def to_columns(articles: Iterable[Article]) -> Dict[str, List[Any]]:
+    """
+    Transpose records into one list per field (``published`` as epoch
+    seconds), the layout Arrow tables are built from.
+    """
+    columns: Dict[str, List[Any]] = {name: [] for name in Article.__slots__}
+    appends = [columns[name].append for name in Article.__slots__]
+    for article in articles:
+        for append, value in zip(appends, article.__getstate__()):
+            append(value)
+    return columns
@@ -0,0 +1,206 @@
+import os
+import sqlite3
+from datetime import date, timedelta
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple
+from urllib.request import pathname2url
+
+import search_index
+import story_index
+from search_index import DESCRIPTION_WEIGHT, TITLE_WEIGHT, build_match_query
+
+# Columns a result can be sorted by; 'relevance' needs a search query
+SORT_COLUMNS = ('published_date', 'title', 'source', 'country', 'language', 'relevance')
+
+# Columns of a result row
+RESULT_COLUMNS = ('article_id', 'title', 'description', 'url', 'published_date', 'source', 'country', 'language', 'story_id')
+
+class ArticleFilters(NamedTuple):
+    """
+    Filters of the dashboard: values to keep per dimension (None keeps all,
+    an empty list none), an inclusive range of publication days and a
+    full-text search query.
+    """
+    countries: Optional[Sequence[str]] = None
+    sources: Optional[Sequence[str]] = None
+    languages: Optional[Sequence[str]] = None
+    start: Optional[date] = None
+    end: Optional[date] = None
+    search: str = ''
+
+class ArticleQuery:
+    """
+    Filtered, sorted and paginated reads of the article store.
+
+    Filtering, sorting and paging run in SQLite on the store's indexes, so a
+    caller only materialises the rows of one page however many articles
+    match. With ``group_stories`` every story (see ``story_index``) is
+    returned once, as its first article in sort order, together with the
+    number of matching articles covering it.
+
+    With ``read_only`` the store is opened read-only and its schema is
+    expected to be in place (``ArticleStore`` creates it), so readers never
+    take the store's write lock.
+    """
+
+    def __init__(self, path: str, read_only: bool = False):
+        if read_only:
+            uri = f"file:{pathname2url(os.path.abspath(path))}?mode=ro"
+            self.conn = sqlite3.connect(uri, uri=True, check_same_thread=False)
+        else:
+            self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute('PRAGMA busy_timeout=5000')
+        if not read_only:
+            search_index.ensure_schema(self.conn)
+            story_index.ensure_schema(self.conn)
+
+    def _matches(self, filters: ArticleFilters) -> Tuple[str, List[Any]]:
+        """
+        SELECT of the matching articles, with a relevance score when searching.
+        """
+        where, params = [], []
+        joins = 'LEFT JOIN article_stories s ON s.article_rowid = a.rowid'
+        score = '0.0'
+        if filters.search:
+            match = build_match_query(filters.search)
+            if match is None:
+                where.append('0')
+            else:
+                joins += ' JOIN articles_fts ON articles_fts.rowid = a.rowid'
+                where.append('articles_fts MATCH ?')
+                params.append(match)
+                score = f'bm25(articles_fts, {TITLE_WEIGHT}, {DESCRIPTION_WEIGHT})'
+        for column, selected in (
+            ('country', filters.countries),
+            ('source', filters.sources),
+            ('language', filters.languages)
+        ):
+            if selected is not None:
+                where.append(f"a.{column} IN ({','.join('?' * len(selected))})" if selected else '0')
+                params.extend(selected)
+        if filters.start is not None:
+            where.append('a.published_date >= ?')
+            params.append(filters.start.isoformat())
+        if filters.end is not None:
+            where.append('a.published_date < ?')
+            params.append((filters.end + timedelta(days=1)).isoformat())
+
+        sql = (
+            'SELECT a.rowid AS row_id, a.article_id, a.title, a.description, a.url, a.published_date, '
+            'a.source, a.country, a.language, COALESCE(s.story_id, -a.rowid) AS story_id, '
+            f'{score} AS score FROM articles a {joins}'
+        )
+        if where:
+            sql += ' WHERE ' + ' AND '.join(where)
+        return sql, params
+
+    @staticmethod
+    def _is_match_error(filters: ArticleFilters, error: sqlite3.OperationalError) -> bool:
+        # A search FTS5 cannot parse matches nothing; other errors are real
+        return bool(filters.search) and str(error).startswith('fts5:')
+
+    @staticmethod
+    def _order(sort: str, descending: bool) -> str:
+        if sort not in SORT_COLUMNS:
+            raise ValueError(f"Cannot sort by {sort}")
+        # Lower bm25 scores are better matches
+        column = 'score' if sort == 'relevance' else sort
+        direction = 'DESC' if descending != (sort == 'relevance') else 'ASC'
+        return f'{column} {direction}, row_id {direction}'
+
+    def count(self, filters: ArticleFilters, group_stories: bool = False) -> int:
+        """
+        Number of matching articles, or of stories with ``group_stories``.
+        """
+        sql, params = self._matches(filters)
+        counted = 'COUNT(DISTINCT story_id)' if group_stories else 'COUNT(*)'
+        try:
+            return self.conn.execute(f'SELECT {counted} FROM ({sql})', params).fetchone()[0]
+        except sqlite3.OperationalError as e:
+            if not self._is_match_error(filters, e):
+                raise
+            return 0
+
+    def _select(
+        self,
+        filters: ArticleFilters,
+        sort: str,
+        descending: bool,
+        limit: int,
+        offset: int = 0,
+        group_stories: bool = False,
+        after: Optional[Tuple[Any, int]] = None
+    ) -> Tuple[List[sqlite3.Row], List[str]]:
+        sql, params = self._matches(filters)
+        order = self._order(sort, descending)
+        columns = list(RESULT_COLUMNS)
+        if group_stories:
+            sql = (
+                'SELECT * FROM ('
+                f'SELECT *, COUNT(*) OVER (PARTITION BY story_id) AS articles, '
+                f'ROW_NUMBER() OVER (PARTITION BY story_id ORDER BY {order}) AS story_rank '
+                f'FROM ({sql})) WHERE story_rank = 1'
+            )
+            columns.append('articles')
+        if after is not None:
+            # Keyset pagination: rows strictly after the (sort key, row_id)
+            # of the previous page's last row
+            key = 'score' if sort == 'relevance' else sort
+            comparison = '<' if descending != (sort == 'relevance') else '>'
+            sql = f'SELECT * FROM ({sql}) WHERE ({key}, row_id) {comparison} (?, ?)'
+            params = [*params, *after]
+        sql += f' ORDER BY {order} LIMIT ? OFFSET ?'
+        try:
+            return self.conn.execute(sql, (*params, limit, offset)).fetchall(), columns
+        except sqlite3.OperationalError as e:
+            if not self._is_match_error(filters, e):
+                raise
+            return [], columns
+
+    def page(
+        self,
+        filters: ArticleFilters,
+        sort: str = 'published_date',
+        descending: bool = True,
+        limit: int = 50,
+        offset: int = 0,
+        group_stories: bool = False
+    ) -> List[Dict[str, Any]]:
+        """
+        One page of matching articles in the requested order.
+
+        Returns:
+            Rows with the ``RESULT_COLUMNS`` (and ``articles``, the story's
+            number of matching articles, with ``group_stories``)
+        """
+        rows, columns = self._select(filters, sort, descending, limit, offset, group_stories)
+        return [{column: row[column] for column in columns} for row in rows]
+
+    def seek(
+        self,
+        filters: ArticleFilters,
+        sort: str = 'published_date',
+        descending: bool = True,
+        limit: int = 100,
+        after: Optional[Tuple[Any, int]] = None,
+        group_stories: bool = False
+    ) -> Tuple[List[Dict[str, Any]], Optional[Tuple[Any, int]]]:
+        """
+        Page of matching articles following the key ``after``.
+
+        Unlike offsets, keys stay cheap deep into a result and do not skip
+        or repeat rows when articles are inserted between pages.
+
+        Returns:
+            The rows (as from ``page``) and the key to pass as ``after`` for
+            the next page, or None after the last page
+        """
+        rows, columns = self._select(filters, sort, descending, limit, 0, group_stories, after)
+        next_key = None
+        if len(rows) == limit:
+            last = rows[-1]
+            next_key = (last['score' if sort == 'relevance' else sort], last['row_id'])
+        return [{column: row[column] for column in columns} for row in rows], next_key
+
+    def close(self) -> None:
+        self.conn.close()
@@ -0,0 +1,147 @@
+import argparse
+import csv
+import logging
+import os
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Iterable, List
+
+import rollups
+import search_index
+import story_index
+# ARTICLE_COLUMNS and article_id are re-exported for existing imports
+from article import ARTICLE_COLUMNS, Article, article_id
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_STORE_PATH = 'data/articles.db'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS articles (
+    article_id TEXT PRIMARY KEY,
+    title TEXT NOT NULL,
+    description TEXT NOT NULL,
+    url TEXT NOT NULL,
+    published_date TEXT NOT NULL,
+    source TEXT NOT NULL,
+    country TEXT NOT NULL,
+    language TEXT NOT NULL,
+    inserted_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_articles_published ON articles (published_date);
+CREATE INDEX IF NOT EXISTS idx_articles_country_source ON articles (country, source);
+CREATE INDEX IF NOT EXISTS idx_articles_inserted ON articles (inserted_at);
+"""
+
+class ArticleStore:
+    """
+    Append-only SQLite store of collected articles.
+
+    Articles are keyed on ``article_id``; inserting an article that is already
+    stored is a no-op, so existing rows are never rewritten and each run only
+    writes the articles it has not seen before. New articles are added to the
+    full-text index, assigned a ``story_id`` shared with their near
+    duplicates (see ``story_index``) and counted into the rollups.
+    """
+
+    def __init__(self, path: str = DEFAULT_STORE_PATH):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.execute('PRAGMA busy_timeout=5000')
+        self.conn.executescript(SCHEMA)
+        search_index.ensure_schema(self.conn)
+        search_index.catch_up(self.conn)
+        story_index.ensure_schema(self.conn)
+        story_index.catch_up(self.conn)
+        rollups.ensure_schema(self.conn)
+        rollups.catch_up(self.conn)
+
+    def upsert(self, entries: Iterable[Article]) -> List[Article]:
+        """
+        Insert articles that are not stored yet.
+
+        Args:
+            entries: Article records as produced by the scraper
+
+        Returns:
+            The articles that were newly inserted, in input order
+        """
+        inserted_at = datetime.now().isoformat(timespec='seconds')
+        new_entries = []
+        indexed = []
+        with self._lock, self.conn:
+            for entry in entries:
+                cursor = self.conn.execute(
+                    'INSERT OR IGNORE INTO articles '
+                    '(article_id, title, description, url, published_date, source, country, language, inserted_at) '
+                    'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                    (entry.article_id, *entry.as_tuple(), inserted_at)
+                )
+                if cursor.rowcount:
+                    new_entries.append(entry)
+                    indexed.append((cursor.lastrowid, entry.title, entry.description))
+
+            # Keep the full-text index, the story clusters and the rollups in
+            # step with the new rows
+            search_index.index_rows(self.conn, indexed)
+            story_index.assign_rows(self.conn, (
+                (rowid, title, description, entry.source, entry.published)
+                for (rowid, title, description), entry in zip(indexed, new_entries)
+            ))
+            rollups.add_rows(self.conn, (
+                (rowid, entry.published, entry.country, entry.source, entry.language)
+                for (rowid, _, _), entry in zip(indexed, new_entries)
+            ))
+        return new_entries
+
+    def count(self) -> int:
+        with self._lock:
+            return self.conn.execute('SELECT COUNT(*) FROM articles').fetchone()[0]
+
+    def import_csv(self, filename: str) -> int:
+        """
+        Import a previously exported CSV file; returns the number of new rows.
+        Rows without a usable publication date are skipped.
+        """
+        with open(filename, newline='', encoding='utf-8') as f:
+            articles = (Article.from_row(row) for row in csv.DictReader(f))
+            return len(self.upsert(article for article in articles if article is not None))
+
+    def close(self) -> None:
+        with self._lock:
+            self.conn.close()
+
+    def __enter__(self) -> 'ArticleStore':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+def main():
+    """
+    Import existing CSV exports into the article store.
+    """
+    parser = argparse.ArgumentParser(description='Import CSV exports into the article store')
+    parser.add_argument('files', nargs='+', help='CSV files to import')
+    parser.add_argument('--store', default=DEFAULT_STORE_PATH, help='Path of the SQLite store')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    with ArticleStore(args.store) as store:
+        for filename in args.files:
+            try:
+                logger.info(f"Imported {store.import_csv(filename)} new articles from {filename}")
+            except (OSError, csv.Error) as e:
+                logger.error(f"Error importing {filename}: {str(e)}")
+        logger.info(f"Store now holds {store.count()} articles")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,229 @@
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta, timezone
+from itertools import chain, zip_longest
+from typing import Dict, List, Tuple
+
+import requests
+from tqdm import tqdm
+
+from article_store import ArticleStore, DEFAULT_STORE_PATH
+from dedup_index import DedupIndex
+from http_session import FeedSession
+from rate_limit import HostRateLimiter
+from scraper import RSSScraper, DEFAULT_MAX_WORKERS
+from sinks import StoreSink
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHECKPOINT_PATH = 'state/backfill.db'
+
+# Days of one feed handled by a single worker task
+DEFAULT_CHUNK_DAYS = 30
+
+# Minimum delay between backfill requests to the same host
+DEFAULT_HOST_INTERVAL = 2.0
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS completed (
+    feed_url TEXT NOT NULL,
+    date TEXT NOT NULL,
+    payload_hash TEXT NOT NULL,
+    entries INTEGER NOT NULL,
+    PRIMARY KEY (feed_url, date)
+);
+CREATE TABLE IF NOT EXISTS static_feeds (
+    feed_url TEXT PRIMARY KEY,
+    detected_at TEXT NOT NULL
+);
+"""
+
+class BackfillCheckpoint:
+    """
+    SQLite record of the (feed, date) pairs a backfill has completed, and of
+    feeds found to ignore the ``date`` parameter.
+    """
+
+    def __init__(self, path: str = DEFAULT_CHECKPOINT_PATH):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.executescript(SCHEMA)
+
+    def completed(self, feed_url: str) -> Dict[str, str]:
+        """
+        Completed dates of a feed mapped to their payload hash.
+        """
+        with self._lock:
+            rows = self.conn.execute(
+                'SELECT date, payload_hash FROM completed WHERE feed_url = ?',
+                (feed_url,)
+            ).fetchall()
+        return dict(rows)
+
+    def mark_done(self, feed_url: str, date_str: str, payload_hash: str, entries: int) -> None:
+        with self._lock, self.conn:
+            self.conn.execute(
+                'INSERT OR REPLACE INTO completed (feed_url, date, payload_hash, entries) VALUES (?, ?, ?, ?)',
+                (feed_url, date_str, payload_hash, entries)
+            )
+
+    def is_static(self, feed_url: str) -> bool:
+        with self._lock:
+            return self.conn.execute(
+                'SELECT 1 FROM static_feeds WHERE feed_url = ?',
+                (feed_url,)
+            ).fetchone() is not None
+
+    def mark_static(self, feed_url: str) -> None:
+        with self._lock, self.conn:
+            self.conn.execute(
+                'INSERT OR IGNORE INTO static_feeds (feed_url, detected_at) VALUES (?, ?)',
+                (feed_url, datetime.now().isoformat(timespec='seconds'))
+            )
+
+    def close(self) -> None:
+        with self._lock:
+            self.conn.close()
+
+    def __enter__(self) -> 'BackfillCheckpoint':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+class _FeedProgress:
+    """
+    Payload hashes seen for one feed during a backfill, shared by the
+    workers handling its date chunks.
+    """
+
+    def __init__(self, hashes: Dict[str, str]):
+        self.lock = threading.Lock()
+        self.dates_by_hash: Dict[str, str] = {h: d for d, h in hashes.items()}
+        self.static = False
+
+    def record(self, date_str: str, payload_hash: str) -> bool:
+        """
+        Remember a payload; returns False if another date had the same one.
+        """
+        with self.lock:
+            other = self.dates_by_hash.get(payload_hash)
+            if other is not None and other != date_str:
+                self.static = True
+                return False
+            self.dates_by_hash[payload_hash] = date_str
+            return True
+
+def _date_chunks(dates: List[str], chunk_days: int) -> List[List[str]]:
+    return [dates[i:i + chunk_days] for i in range(0, len(dates), chunk_days)]
+
+def backfill_feeds(
+    feeds: List[Dict[str, str]],
+    days: int = 365,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    chunk_days: int = DEFAULT_CHUNK_DAYS,
+    host_interval: float = DEFAULT_HOST_INTERVAL,
+    output_format: str = 'csv',
+    store_path: str = DEFAULT_STORE_PATH,
+    checkpoint_path: str = DEFAULT_CHECKPOINT_PATH,
+    export: bool = True
+) -> int:
+    """
+    Backfill the last ``days`` days of every feed via its ``?date=`` URL.
+
+    Each feed's pending dates (newest first) are split into chunks that run
+    on a bounded thread pool, with requests to a host spaced at least
+    ``host_interval`` seconds apart. Every completed (feed, date) pair is
+    checkpointed, so an interrupted backfill resumes where it stopped. A feed
+    that returns the same document for two different dates ignores the date
+    parameter; it is marked static and not requested again.
+
+    Args:
+        feeds: List of feed information dictionaries
+        days: Number of days to go back
+        max_workers: Maximum number of requests in flight
+        chunk_days: Number of consecutive days handled by one task
+        host_interval: Minimum delay between requests to the same host
+        output_format: Export format ('csv', 'json' or 'parquet')
+        store_path: Path of the SQLite article store
+        checkpoint_path: Path of the backfill checkpoint database
+        export: Whether to append new articles to the daily export files
+
+    Returns:
+        Number of new articles stored
+    """
+    # Entry dates are naive UTC
+    end_date = datetime.now(timezone.utc).replace(tzinfo=None)
+    start_date = end_date - timedelta(days=days)
+    all_dates = [(end_date - timedelta(days=offset)).strftime('%Y-%m-%d') for offset in range(days + 1)]
+    rate_limiter = HostRateLimiter(host_interval)
+
+    with BackfillCheckpoint(checkpoint_path) as checkpoint, \
+            FeedSession() as session, \
+            DedupIndex() as dedup_index, \
+            ArticleStore(store_path) as store:
+        sink = StoreSink(store, output_format=output_format, export=export, dedup_index=dedup_index)
+
+        feed_tasks: List[List[Tuple[Dict[str, str], _FeedProgress, List[str]]]] = []
+        for feed_info in feeds:
+            if checkpoint.is_static(feed_info['url']):
+                logger.info(f"Skipping {feed_info['url']}: ignores the date parameter")
+                continue
+            done = checkpoint.completed(feed_info['url'])
+            pending = [d for d in all_dates if d not in done]
+            progress = _FeedProgress(done)
+            feed_tasks.append([(feed_info, progress, chunk) for chunk in _date_chunks(pending, chunk_days)])
+
+        # Interleave feeds so workers spread over hosts instead of queueing on one
+        tasks = [task for task in chain.from_iterable(zip_longest(*feed_tasks)) if task is not None]
+
+        def run_chunk(feed_info: Dict[str, str], progress: _FeedProgress, dates: List[str]) -> int:
+            scraper = RSSScraper(feed_info, rate_limiter, session=session, dedup_index=dedup_index)
+            processed = 0
+            for date_str in dates:
+                if progress.static:
+                    break
+                try:
+                    content = scraper.fetch_payload(scraper.historical_url(date_str))
+                except requests.RequestException as e:
+                    logger.error(f"Error fetching historical feed {feed_info['url']} for {date_str}: {str(e)}")
+                    continue
+
+                payload_hash = hashlib.sha256(content or b'').hexdigest()
+                if not progress.record(date_str, payload_hash):
+                    logger.info(f"{feed_info['url']} ignores the date parameter, stopping its backfill")
+                    checkpoint.mark_static(feed_info['url'])
+                    break
+
+                try:
+                    new_entries = sink.write(feed_info, scraper.process_payload(content, start_date, end_date))
+                except Exception as e:
+                    logger.error(f"Error processing historical feed {feed_info['url']} for {date_str}: {str(e)}")
+                    continue
+                checkpoint.mark_done(feed_info['url'], date_str, payload_hash, new_entries)
+                processed += 1
+            return processed
+
+        try:
+            with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+                futures = [executor.submit(run_chunk, *task) for task in tasks]
+                for future in tqdm(as_completed(futures), total=len(futures), desc="Backfilling feeds"):
+                    try:
+                        future.result()
+                    except Exception as e:
+                        logger.error(f"Unexpected error in backfill task: {str(e)}")
+        finally:
+            sink.close()
+            # Persist the keys of the articles the store accepted
+            dedup_index.commit()
+
+    logger.info(f"Backfill collected {sink.new_entries} new entries")
+    return sink.new_entries
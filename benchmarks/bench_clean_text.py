@@ -0,0 +1,91 @@
+"""
+Microbenchmark for text_cleaning.clean_text against the original
+BeautifulSoup-per-field implementation.
+
+Usage:
+    python benchmarks/bench_clean_text.py [--repeat N]
+"""
+import argparse
+import csv
+import glob
+import os
+import re
+import sys
+import time
+import warnings
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bs4 import BeautifulSoup, MarkupResemblesLocatorWarning
+
+from text_cleaning import clean_text
+
+warnings.filterwarnings('ignore', category=MarkupResemblesLocatorWarning)
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data')
+
+
+def legacy_clean_text(text: str) -> str:
+    """The implementation clean_text replaced, used as the reference."""
+    if not text:
+        return ""
+    soup = BeautifulSoup(text, 'html.parser')
+    text = soup.get_text()
+    text = re.sub(r'\s+', ' ', text)
+    text = re.sub(r'[^\w\s.,!?-]', '', text)
+    return text.strip()
+
+
+def load_corpus():
+    """Titles and descriptions from the per-feed CSV files."""
+    texts = []
+    for filename in sorted(glob.glob(os.path.join(DATA_DIR, '*.csv'))):
+        if os.path.basename(filename).startswith('all_news_'):
+            continue
+        with open(filename, encoding='utf-8') as f:
+            for row in csv.DictReader(f):
+                texts.append(row.get('title') or '')
+                texts.append(row.get('description') or '')
+    return texts
+
+
+def as_markup(texts):
+    """Wrap corpus text the way RSS descriptions typically arrive."""
+    return [
+        f'<p>{text.replace("&", "&amp;")}</p><a href="https://example.com/?a=1&amp;b=2">More</a>&nbsp;&#8230;'
+        for text in texts
+    ]
+
+
+def bench(func, texts, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for text in texts:
+            func(text)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    plain = load_corpus()
+    markup = as_markup(plain)
+
+    for name, texts in (('plain', plain), ('markup', markup)):
+        mismatches = sum(1 for text in texts if clean_text(text) != legacy_clean_text(text))
+        legacy = bench(legacy_clean_text, texts, args.repeat)
+        fast = bench(clean_text, texts, args.repeat)
+        print(
+            f"{name:<7} fields={len(texts):<6} mismatches={mismatches:<3} "
+            f"legacy={legacy / len(texts) * 1e6:8.2f}us/field "
+            f"fast={fast / len(texts) * 1e6:8.2f}us/field "
+            f"speedup={legacy / fast:6.1f}x"
+        )
+
+
+if __name__ == '__main__':
+    main()
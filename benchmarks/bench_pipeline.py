@@ -0,0 +1,300 @@
+"""
+Throughput benchmarks of the scraping pipeline on recorded feed fixtures.
+
+Replays the fixtures in benchmarks/fixtures through a local stub HTTP server
+at several corpus scales (copies of the fixture set with unique links and
+titles) and measures the end-to-end run as well as each stage on its own:
+entries/sec, MB/sec of feed documents and peak RSS. Every case runs in a
+fresh process, so caches and peak RSS do not leak between cases. Results are
+written as JSON for comparison between commits.
+
+Usage:
+    python benchmarks/bench_pipeline.py [--scales 1,10,100] [--cases parse,clean] [--output FILE]
+    python benchmarks/bench_pipeline.py --compare BASELINE.json RESULT.json
+"""
+import argparse
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, ROOT)
+sys.path.insert(0, BENCH_DIR)
+
+from feed_fixtures import FIXTURE_DIR, MANIFEST, feed_list, fixture_digest, generate, load_manifest, load_payloads, scale_payload
+from stub_server import FixtureServer
+
+RESULTS_DIR = os.path.join(BENCH_DIR, 'results')
+
+STAGE_CASES = ('fetch', 'parse', 'date', 'dedup', 'clean', 'language', 'store')
+CASES = ('end_to_end', 'end_to_end_unchanged') + STAGE_CASES
+
+
+def peak_rss_mb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def recorded_cutoff(manifest):
+    """Date cutoff as of the day the fixtures were recorded."""
+    from utils import timeframe_cutoff
+
+    return timeframe_cutoff(now=datetime.fromisoformat(manifest['recorded_at']))
+
+
+def _documents(manifest, scale):
+    payloads = load_payloads()
+    contents = [scale_payload(payloads[feed['file']], copy) for copy in range(scale) for feed in manifest['feeds']]
+    return list(zip(feed_list(manifest, 'http://fixtures', scale), contents))
+
+
+def _scrapers(documents, **kwargs):
+    from language_detection import LanguageDetector
+    from rate_limit import HostRateLimiter
+    from scraper import RSSScraper
+
+    detector = LanguageDetector()
+    return [
+        RSSScraper(feed_info, HostRateLimiter(0), language_detector=detector, **kwargs)
+        for feed_info, _ in documents
+    ]
+
+
+def run_end_to_end(manifest, scale, base_url, unchanged=False):
+    import scraper
+    from article_store import ArticleStore
+    from rate_limit import HostRateLimiter
+
+    feeds = feed_list(manifest, base_url, scale)
+    workdir = tempfile.mkdtemp(prefix='bench-')
+    os.chdir(workdir)
+    # Judge entry dates against the day the fixtures were recorded
+    cutoff = recorded_cutoff(manifest)
+    scraper.timeframe_cutoff = lambda: cutoff
+
+    def cycle():
+        scraper.scrape_all_feeds(feeds, metrics_paths=(), rate_limiter=HostRateLimiter(0))
+
+    if unchanged:
+        # A first cycle stores everything; the timed one only gets 304s
+        cycle()
+    started = time.perf_counter()
+    cycle()
+    seconds = time.perf_counter() - started
+    with ArticleStore('data/articles.db') as store:
+        stored = store.count()
+    return seconds, {'stored': stored}
+
+
+def run_fetch(manifest, scale, base_url):
+    from concurrent.futures import ThreadPoolExecutor
+
+    from http_session import FeedSession
+    from rate_limit import HostRateLimiter
+    from scraper import DEFAULT_MAX_WORKERS, RSSScraper
+
+    feeds = feed_list(manifest, base_url, scale)
+    rate_limiter = HostRateLimiter(0)
+    with FeedSession() as session, ThreadPoolExecutor(max_workers=DEFAULT_MAX_WORKERS) as executor:
+        started = time.perf_counter()
+        sizes = list(executor.map(
+            lambda feed_info: len(RSSScraper(feed_info, rate_limiter, session=session).fetch_payload() or b''),
+            feeds
+        ))
+        seconds = time.perf_counter() - started
+    return seconds, {'bytes_fetched': sum(sizes)}
+
+
+def run_stage(manifest, scale, stage):
+    """
+    Time one processing stage; the stages before it run untimed to produce
+    its input.
+    """
+    from collections import Counter
+
+    import feedparser
+
+    from article_store import ArticleStore
+    from dedup_index import DedupIndex
+    from sinks import StoreSink
+    from utils import iter_unique_entries
+
+    documents = _documents(manifest, scale)
+    workdir = tempfile.mkdtemp(prefix='bench-')
+    dedup_index = DedupIndex(os.path.join(workdir, 'dedup.db'))
+    scrapers = _scrapers(documents, dedup_index=dedup_index)
+    cutoff = recorded_cutoff(manifest)
+    drops = Counter()
+    timings = {}
+
+    def step(name, func, values):
+        started = time.perf_counter()
+        results = [list(func(scraper, value)) for scraper, value in zip(scrapers, values)]
+        timings[name] = time.perf_counter() - started
+        return results
+
+    contents = [content for _, content in documents]
+    feeds = step('parse', lambda s, content: feedparser.parse(content).entries, contents)
+    if stage == 'parse':
+        return timings['parse'], {}
+    dated = step('date', lambda s, entries: s._filter_by_date(entries, cutoff, None, drops), feeds)
+    if stage == 'date':
+        return timings['date'], {}
+    unseen = step('dedup', lambda s, items: s._drop_seen(items, drops), dated)
+    cleaned = step('clean', lambda s, items: s._clean(items, drops), unseen)
+    if stage == 'dedup':
+        # Both dedup passes: the index lookup and the in-feed duplicate check
+        step('unique', lambda s, articles: iter_unique_entries(articles, drops), cleaned)
+        return timings['dedup'] + timings['unique'], {}
+    if stage == 'clean':
+        return timings['clean'], {}
+    tagged = step('language', lambda s, articles: s._tag_language(articles), cleaned)
+    if stage == 'language':
+        return timings['language'], {}
+
+    with ArticleStore(os.path.join(workdir, 'articles.db')) as store:
+        sink = StoreSink(store, data_dir=workdir)
+        started = time.perf_counter()
+        for (feed_info, _), articles in zip(documents, tagged):
+            sink.write(feed_info, articles)
+        sink.close()
+        seconds = time.perf_counter() - started
+    return seconds, {'stored': sink.new_entries}
+
+
+def run_case(case, scale, base_url):
+    manifest = load_manifest()
+    baseline_rss = peak_rss_mb()
+    if case in ('end_to_end', 'end_to_end_unchanged'):
+        seconds, extra = run_end_to_end(manifest, scale, base_url, unchanged=case == 'end_to_end_unchanged')
+    elif case == 'fetch':
+        seconds, extra = run_fetch(manifest, scale, base_url)
+    else:
+        seconds, extra = run_stage(manifest, scale, case)
+
+    entries = scale * sum(feed['entries'] for feed in manifest['feeds'])
+    size = scale * sum(feed['bytes'] for feed in manifest['feeds'])
+    return {
+        'case': case,
+        'scale': scale,
+        'entries': entries,
+        'bytes': size,
+        'seconds': round(seconds, 6),
+        'entries_per_sec': round(entries / seconds, 1) if seconds else None,
+        'mb_per_sec': round(size / 1e6 / seconds, 3) if seconds else None,
+        'peak_rss_mb': round(peak_rss_mb(), 1),
+        'startup_rss_mb': round(baseline_rss, 1),
+        **extra
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_suite(cases, scales):
+    if not os.path.exists(os.path.join(FIXTURE_DIR, MANIFEST)):
+        generate()
+    manifest = load_manifest()
+    results = []
+    with FixtureServer() as server:
+        for scale in scales:
+            for case in cases:
+                completed = subprocess.run(
+                    [sys.executable, __file__, '--run-case', case, '--scale', str(scale), '--base-url', server.base_url],
+                    capture_output=True, text=True
+                )
+                if completed.returncode != 0:
+                    print(f"{case} x{scale} failed:\n{completed.stderr[-2000:]}", file=sys.stderr)
+                    continue
+                result = json.loads(completed.stdout.strip().splitlines()[-1])
+                results.append(result)
+                print(
+                    f"{case:<22} x{scale:<4} {result['seconds']:9.3f}s "
+                    f"{result['entries_per_sec']:>10} entries/s {result['mb_per_sec']:>8} MB/s "
+                    f"peak RSS {result['peak_rss_mb']:7.1f} MB"
+                )
+    return {
+        'commit': git_commit(),
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'fixtures': {
+            'digest': fixture_digest(manifest),
+            'feeds': len(manifest['feeds']),
+            'entries': sum(feed['entries'] for feed in manifest['feeds']),
+            'bytes': sum(feed['bytes'] for feed in manifest['feeds'])
+        },
+        'results': results
+    }
+
+
+def compare(baseline_path, result_path):
+    with open(baseline_path, encoding='utf-8') as f:
+        baseline = json.load(f)
+    with open(result_path, encoding='utf-8') as f:
+        result = json.load(f)
+    if baseline['fixtures']['digest'] != result['fixtures']['digest']:
+        print("warning: the runs used different fixtures", file=sys.stderr)
+    before = {(row['case'], row['scale']): row for row in baseline['results']}
+    print(f"{'case':<22} {'scale':<6} {'before':>10} {'after':>10} {'speedup':>8} {'RSS delta':>10}")
+    for row in result['results']:
+        old = before.get((row['case'], row['scale']))
+        if old is None:
+            continue
+        print(
+            f"{row['case']:<22} x{row['scale']:<5} {old['seconds']:9.3f}s {row['seconds']:9.3f}s "
+            f"{old['seconds'] / row['seconds']:7.2f}x {row['peak_rss_mb'] - old['peak_rss_mb']:+9.1f}M"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--scales', default='1,10,100', help="Comma-separated corpus scales")
+    parser.add_argument('--cases', default=','.join(CASES), help="Comma-separated cases to run")
+    parser.add_argument('--output', help="Results file (default: benchmarks/results/<time>-<commit>.json)")
+    parser.add_argument('--compare', nargs=2, metavar=('BASELINE', 'RESULT'), help="Compare two results files")
+    parser.add_argument('--run-case', help=argparse.SUPPRESS)
+    parser.add_argument('--scale', type=int, default=1, help=argparse.SUPPRESS)
+    parser.add_argument('--base-url', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare)
+        return
+    if args.run_case:
+        import logging
+        logging.disable(logging.CRITICAL)
+        print(json.dumps(run_case(args.run_case, args.scale, args.base_url)))
+        return
+
+    cases = [case for case in args.cases.split(',') if case]
+    unknown = set(cases) - set(CASES)
+    if unknown:
+        parser.error(f"unknown cases: {', '.join(sorted(unknown))}")
+    report = run_suite(cases, [int(scale) for scale in args.scales.split(',')])
+    output = args.output or os.path.join(
+        RESULTS_DIR, f"{datetime.now().strftime('%Y%m%d-%H%M%S')}-{report['commit'] or 'unknown'}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {output}")
+
+
+if __name__ == '__main__':
+    main()
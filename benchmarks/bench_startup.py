@@ -0,0 +1,136 @@
+"""
+Startup-time budget of the scraper's entry points.
+
+Times ``import main`` and ``import scheduler`` in fresh interpreters, then
+runs a cycle against the fixture stub server in which every feed answers
+304 Not Modified (its validators come from a priming cycle in another
+process). Neither may load the heavy dependencies, which are only needed
+once a changed document is parsed, cleaned, language-tagged or exported to
+Parquet. The exit status is non-zero if a heavy module was loaded or the
+median import time exceeds the budget.
+
+Usage:
+    python benchmarks/bench_startup.py [--budget-ms 300] [--repeat 5]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, ROOT)
+sys.path.insert(0, BENCH_DIR)
+
+ENTRY_POINTS = ('main', 'scheduler')
+
+# Modules a run without changed documents must not import
+HEAVY_MODULES = ('pandas', 'numpy', 'pyarrow', 'langdetect', 'bs4', 'feedparser')
+
+DEFAULT_BUDGET_MS = 300
+
+
+def loaded_heavy_modules():
+    return [name for name in HEAVY_MODULES if name in sys.modules]
+
+
+def run_import(module):
+    started = time.perf_counter()
+    __import__(module)
+    return {'seconds': time.perf_counter() - started, 'heavy': loaded_heavy_modules()}
+
+
+def run_cycle(base_url, prime):
+    from feed_fixtures import feed_list, load_manifest
+    from rate_limit import HostRateLimiter
+
+    started = time.perf_counter()
+    import scraper
+    imported = time.perf_counter()
+    scraper.scrape_all_feeds(
+        feed_list(load_manifest(), base_url, 1),
+        metrics_paths=(),
+        rate_limiter=HostRateLimiter(0)
+    )
+    finished = time.perf_counter()
+    return {
+        'import_seconds': imported - started,
+        'cycle_seconds': finished - imported,
+        'heavy': [] if prime else loaded_heavy_modules()
+    }
+
+
+def child(args, workdir):
+    """Run this script in a fresh interpreter inside ``workdir``."""
+    completed = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), *args],
+        cwd=workdir, capture_output=True, text=True
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(f"{' '.join(args)} failed:\n{completed.stderr[-2000:]}")
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def run_suite(budget_ms, repeat):
+    from feed_fixtures import FIXTURE_DIR, MANIFEST, generate
+    from stub_server import FixtureServer
+
+    failures = []
+    for module in ENTRY_POINTS:
+        runs = []
+        for _ in range(repeat):
+            # Entry points create data/ and logs/ in the working directory
+            runs.append(child(['--run-import', module], tempfile.mkdtemp(prefix='bench-startup-')))
+        median_ms = statistics.median(run['seconds'] for run in runs) * 1000
+        heavy = sorted({name for run in runs for name in run['heavy']})
+        print(f"import {module:<10} median {median_ms:7.1f} ms (budget {budget_ms} ms) heavy: {', '.join(heavy) or 'none'}")
+        if median_ms > budget_ms:
+            failures.append(f"import {module} took {median_ms:.1f} ms")
+        if heavy:
+            failures.append(f"import {module} loaded {', '.join(heavy)}")
+
+    if not os.path.exists(os.path.join(FIXTURE_DIR, MANIFEST)):
+        generate()
+    workdir = tempfile.mkdtemp(prefix='bench-startup-')
+    with FixtureServer() as server:
+        child(['--run-cycle', '--prime', '--base-url', server.base_url], workdir)
+        result = child(['--run-cycle', '--base-url', server.base_url], workdir)
+    print(
+        f"304-only cycle      import {result['import_seconds'] * 1000:7.1f} ms, "
+        f"cycle {result['cycle_seconds'] * 1000:7.1f} ms heavy: {', '.join(result['heavy']) or 'none'}"
+    )
+    if result['heavy']:
+        failures.append(f"the 304-only cycle loaded {', '.join(result['heavy'])}")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--budget-ms', type=float, default=DEFAULT_BUDGET_MS,
+                        help="Largest allowed median import time of an entry point")
+    parser.add_argument('--repeat', type=int, default=5, help="Fresh interpreters timed per entry point")
+    parser.add_argument('--run-import', help=argparse.SUPPRESS)
+    parser.add_argument('--run-cycle', action='store_true', help=argparse.SUPPRESS)
+    parser.add_argument('--prime', action='store_true', help=argparse.SUPPRESS)
+    parser.add_argument('--base-url', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run_import or args.run_cycle:
+        import logging
+        logging.disable(logging.CRITICAL)
+        result = run_import(args.run_import) if args.run_import else run_cycle(args.base_url, args.prime)
+        print(json.dumps(result))
+        return
+
+    failures = run_suite(args.budget_ms, args.repeat)
+    for failure in failures:
+        print(f"FAIL: {failure}", file=sys.stderr)
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,177 @@
+"""
+Recorded feed fixtures for the benchmarks.
+
+The fixtures are RSS 2.0 and Atom documents rebuilt from the per-feed CSV
+exports in data/ (one document per feed, descriptions wrapped in the kind of
+markup feeds deliver), so the benchmarks replay representative payloads
+without touching the network. Regenerate them with:
+
+    python benchmarks/feed_fixtures.py
+"""
+import csv
+import glob
+import hashlib
+import json
+import os
+import re
+from datetime import datetime, timezone
+from email.utils import format_datetime
+from xml.sax.saxutils import escape, quoteattr
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_DIR = os.path.join(ROOT, 'data')
+FIXTURE_DIR = os.path.join(ROOT, 'benchmarks', 'fixtures')
+MANIFEST = 'manifest.json'
+
+# Every third feed is written as Atom, the rest as RSS 2.0
+ATOM_EVERY = 3
+
+_LINK_RE = re.compile(rb'(<link>|<link href="|<guid[^>]*>|<id>)(https?://)')
+_TITLE_RE = re.compile(rb'(<title[^>]*>)')
+
+
+def _slug(name):
+    return re.sub(r'[^A-Za-z0-9]+', '_', name).strip('_')
+
+
+def _description(text):
+    if not text:
+        return ''
+    return (
+        f'<p>{escape(text)}</p><a href="https://example.com/?a=1&amp;b=2">More</a>&nbsp;&#8230;'
+    )
+
+
+def _rss(rows, agency):
+    items = []
+    for row in rows:
+        published = datetime.fromisoformat(row['published_date'])
+        items.append(
+            '<item>'
+            f'<title><![CDATA[{row["title"]}]]></title>'
+            f'<link>{escape(row["url"])}</link>'
+            f'<guid isPermaLink="true">{escape(row["url"])}</guid>'
+            f'<description>{escape(_description(row["description"]))}</description>'
+            f'<pubDate>{format_datetime(published.replace(tzinfo=timezone.utc))}</pubDate>'
+            '</item>'
+        )
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        '<rss version="2.0"><channel>'
+        f'<title>{escape(agency)}</title><link>https://example.com/</link>'
+        f'<description>{escape(agency)} news</description><ttl>30</ttl>'
+        + '\n'.join(items) +
+        '</channel></rss>\n'
+    )
+
+
+def _atom(rows, agency):
+    entries = []
+    for row in rows:
+        published = datetime.fromisoformat(row['published_date']).isoformat() + 'Z'
+        entries.append(
+            '<entry>'
+            f'<title type="html">{escape(row["title"])}</title>'
+            f'<link href={quoteattr(row["url"])}/>'
+            f'<id>{escape(row["url"])}</id>'
+            f'<published>{published}</published><updated>{published}</updated>'
+            f'<summary type="html">{escape(_description(row["description"]))}</summary>'
+            '</entry>'
+        )
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        '<feed xmlns="http://www.w3.org/2005/Atom">'
+        f'<title>{escape(agency)}</title><id>https://example.com/</id>'
+        + '\n'.join(entries) +
+        '</feed>\n'
+    )
+
+
+def generate(data_dir=DATA_DIR, fixture_dir=FIXTURE_DIR):
+    """Rebuild the fixture documents and their manifest from the CSV exports."""
+    os.makedirs(fixture_dir, exist_ok=True)
+    feeds = []
+    recorded_at = ''
+    for index, filename in enumerate(sorted(glob.glob(os.path.join(data_dir, '*.csv')))):
+        if os.path.basename(filename).startswith('all_news_'):
+            continue
+        with open(filename, encoding='utf-8') as f:
+            rows = [row for row in csv.DictReader(f) if row.get('published_date')]
+        if not rows:
+            continue
+        agency, country = rows[0]['source'], rows[0]['country']
+        kind = 'atom' if index % ATOM_EVERY == ATOM_EVERY - 1 else 'rss'
+        document = (_atom if kind == 'atom' else _rss)(rows, agency).encode('utf-8')
+        name = f"{_slug(country)}_{_slug(agency)}.xml"
+        with open(os.path.join(fixture_dir, name), 'wb') as f:
+            f.write(document)
+        recorded_at = max(recorded_at, max(row['published_date'] for row in rows))
+        feeds.append({
+            'file': name,
+            'format': kind,
+            'agency': agency,
+            'country': country,
+            'entries': len(rows),
+            'bytes': len(document),
+            'sha256': hashlib.sha256(document).hexdigest()
+        })
+    manifest = {'recorded_at': recorded_at, 'feeds': feeds}
+    with open(os.path.join(fixture_dir, MANIFEST), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+def load_manifest(fixture_dir=FIXTURE_DIR):
+    with open(os.path.join(fixture_dir, MANIFEST), encoding='utf-8') as f:
+        return json.load(f)
+
+
+def load_payloads(fixture_dir=FIXTURE_DIR):
+    """Fixture documents by file name."""
+    payloads = {}
+    for feed in load_manifest(fixture_dir)['feeds']:
+        with open(os.path.join(fixture_dir, feed['file']), 'rb') as f:
+            payloads[feed['file']] = f.read()
+    return payloads
+
+
+def fixture_digest(manifest):
+    """Digest identifying the fixture set, recorded with every result."""
+    digest = hashlib.sha256()
+    for feed in manifest['feeds']:
+        digest.update(feed['sha256'].encode('ascii'))
+    return digest.hexdigest()[:16]
+
+
+def scale_payload(payload, copy):
+    """
+    Copy ``copy`` of a document: links and titles are made unique to the
+    copy, so dedup, the store and the text caches treat it as new articles.
+    """
+    if copy == 0:
+        return payload
+    marker = b'%d ' % copy
+    payload = _LINK_RE.sub(rb'\1\2c%d.' % copy, payload)
+    return _TITLE_RE.sub(lambda match: match.group(1) + marker, payload)
+
+
+def feed_list(manifest, base_url, scale):
+    """Feed definitions of the corpus at ``scale``, served from ``base_url``."""
+    return [
+        {
+            'url': f"{base_url}/{feed['file']}?copy={copy}",
+            'agency': feed['agency'],
+            'country': feed['country']
+        }
+        for copy in range(scale)
+        for feed in manifest['feeds']
+    ]
+
+
+if __name__ == '__main__':
+    manifest = generate()
+    print(
+        f"Wrote {len(manifest['feeds'])} fixtures "
+        f"({sum(feed['entries'] for feed in manifest['feeds'])} entries, "
+        f"{sum(feed['bytes'] for feed in manifest['feeds']) / 1e6:.2f} MB) to {FIXTURE_DIR}"
+    )
@@ -0,0 +1,68 @@
+"""
+Local HTTP server replaying the feed fixtures.
+
+Serves ``/<fixture file>?copy=N`` with copy N of the fixture document (see
+feed_fixtures.scale_payload), with an ETag so conditional requests of a
+second cycle are answered 304 Not Modified like an unchanged real feed.
+"""
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from feed_fixtures import load_manifest, load_payloads, scale_payload
+
+
+class _FixtureHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        parts = urlsplit(self.path)
+        name = parts.path.lstrip('/')
+        payload = self.server.payloads.get(name)
+        if payload is None:
+            self.send_response(404)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        copy = int(parse_qs(parts.query).get('copy', ['0'])[0])
+        etag = f'"{self.server.digests[name][:16]}-{copy}"'
+        if self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        body = scale_payload(payload, copy)
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/xml; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('ETag', etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FixtureServer:
+    """Fixture server on a free loopback port, run in a background thread."""
+
+    def __init__(self, host='127.0.0.1', port=0):
+        self._server = ThreadingHTTPServer((host, port), _FixtureHandler)
+        self._server.daemon_threads = True
+        self._server.payloads = load_payloads()
+        self._server.digests = {feed['file']: feed['sha256'] for feed in load_manifest()['feeds']}
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._server.shutdown()
+        self._server.server_close()
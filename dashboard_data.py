@@ -0,0 +1,129 @@
+import glob
+import json
+import logging
+import os
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from article import ARTICLE_COLUMNS, Article
+from article_store import ArticleStore, DEFAULT_STORE_PATH
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DATA_DIR = 'data'
+DEFAULT_CACHE_DIR = 'data/.cache'
+
+Signature = Tuple[Tuple[str, int, int], ...]
+
+def data_files(data_dir: str = DEFAULT_DATA_DIR) -> List[str]:
+    """
+    Per-feed export files and the part files of the Parquet dataset; the
+    combined all_news_* files duplicate the per-feed ones.
+    """
+    files = glob.glob(os.path.join(data_dir, '*.csv')) + glob.glob(os.path.join(data_dir, '*.json'))
+    files = [f for f in files if not os.path.basename(f).startswith('all_news_')]
+    files += glob.glob(os.path.join(data_dir, 'parquet', '**', '*.parquet'), recursive=True)
+    return sorted(files)
+
+def _partition_values(filename: str) -> Dict[str, str]:
+    # Hive-style key=value directories of a dataset part file
+    parts = os.path.dirname(filename).split(os.sep)
+    return dict(part.split('=', 1) for part in parts if '=' in part)
+
+def data_signature(data_dir: str = DEFAULT_DATA_DIR) -> Signature:
+    """
+    Cheap fingerprint of the export files (path, size, mtime) used to decide
+    which of them need importing.
+    """
+    signature = []
+    for filename in data_files(data_dir):
+        try:
+            stat = os.stat(filename)
+        except OSError:
+            continue
+        signature.append((filename, stat.st_size, stat.st_mtime_ns))
+    return tuple(signature)
+
+def _read_file(filename: str) -> pd.DataFrame:
+    if filename.endswith('.parquet'):
+        df = pd.read_parquet(filename)
+        df['country'] = _partition_values(filename).get('country', '')
+    elif filename.endswith('.json'):
+        df = pd.read_json(filename, orient='records', lines=True, dtype=False)
+    else:
+        df = pd.read_csv(filename, dtype=str, keep_default_na=False)
+    return df
+
+class ExportImport:
+    """
+    Imports the export files into the article store for the dashboard.
+
+    A manifest records the signature of every file already imported, so a
+    refresh only reads files that are new or have changed since (exports
+    are appended to); the store skips the articles it already holds. Files
+    written before the store existed, or copied in from elsewhere, become
+    visible to the dashboard's queries this way.
+    """
+
+    def __init__(
+        self,
+        data_dir: str = DEFAULT_DATA_DIR,
+        cache_dir: str = DEFAULT_CACHE_DIR,
+        store_path: str = DEFAULT_STORE_PATH
+    ):
+        self.data_dir = data_dir
+        self.cache_dir = cache_dir
+        self.store_path = store_path
+        self.manifest_path = os.path.join(cache_dir, 'manifest.json')
+
+    def _load_manifest(self) -> Dict[str, List[int]]:
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_manifest(self, manifest: Dict[str, List[int]]) -> None:
+        os.makedirs(self.cache_dir, exist_ok=True)
+        try:
+            with open(f"{self.manifest_path}.tmp", 'w', encoding='utf-8') as f:
+                json.dump(manifest, f)
+            os.replace(f"{self.manifest_path}.tmp", self.manifest_path)
+        except OSError as e:
+            logger.error(f"Error saving import manifest: {str(e)}")
+
+    def sync(self, signature: Optional[Signature] = None) -> Tuple[int, List[str]]:
+        """
+        Upsert new and changed export files into the store.
+
+        Returns:
+            Number of articles in the store and error messages for
+            unreadable files
+        """
+        if signature is None:
+            signature = data_signature(self.data_dir)
+        current = {filename: [size, mtime] for filename, size, mtime in signature}
+        manifest = self._load_manifest()
+        stale = [f for f in current if manifest.get(f) != current[f]]
+        loaded = {f: manifest[f] for f in manifest if f in current and f not in stale}
+
+        errors = []
+        with ArticleStore(self.store_path) as store:
+            for filename in stale:
+                try:
+                    df = _read_file(filename)
+                    rows = df.reindex(columns=ARTICLE_COLUMNS, fill_value='').to_dict('records')
+                    store.upsert(article for article in map(Article.from_row, rows) if article is not None)
+                    loaded[filename] = current[filename]
+                except Exception as e:
+                    errors.append(f"Error reading {filename}: {str(e)}")
+            total = store.count()
+
+        if loaded != manifest:
+            self._save_manifest(loaded)
+        # Frame of the former columnar cache, superseded by the store
+        obsolete = os.path.join(self.cache_dir, 'articles.parquet')
+        if os.path.exists(obsolete):
+            os.remove(obsolete)
+        return total, errors
@@ -0,0 +1,118 @@
+import logging
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, Dict, Mapping, Optional
+
+logger = logging.getLogger(__name__)
+
+def _parse_rfc822(value: str) -> datetime:
+    return parsedate_to_datetime(value)
+
+def _parse_iso8601(value: str) -> datetime:
+    return datetime.fromisoformat(value)
+
+def _strptime(fmt: str) -> Callable[[str], datetime]:
+    return lambda value: datetime.strptime(value, fmt)
+
+# Candidate parsers, tried in order until one succeeds for a feed
+DATE_FORMATS: Dict[str, Callable[[str], datetime]] = {
+    'rfc822': _parse_rfc822,
+    'iso8601': _parse_iso8601,
+    'rfc822-no-weekday': _strptime('%d %b %Y %H:%M:%S %z'),
+    'rfc822-no-seconds': _strptime('%a, %d %b %Y %H:%M %z'),
+    'date-time-space': _strptime('%Y-%m-%d %H:%M:%S'),
+    'day-month-year': _strptime('%d/%m/%Y %H:%M:%S'),
+}
+
+def to_naive_utc(dt: datetime) -> datetime:
+    """
+    Convert an aware datetime to naive UTC; naive values are kept as is.
+    """
+    if dt.tzinfo is not None:
+        dt = dt.astimezone(timezone.utc).replace(tzinfo=None)
+    return dt
+
+def from_struct_time(value: time.struct_time) -> datetime:
+    """
+    Convert a feedparser ``*_parsed`` struct (always UTC) to naive UTC.
+    """
+    return datetime(*value[:6])
+
+class DateParser:
+    """
+    Feed-aware date parser.
+
+    Prefers the ``published_parsed``/``updated_parsed`` structs feedparser has
+    already produced, handles RFC 822 and ISO 8601 strings directly, and
+    remembers which format worked for each feed so later entries of the same
+    feed try it first. Unparseable dates are counted per feed and returned as
+    ``None`` rather than replaced with the current time.
+    """
+
+    def __init__(self):
+        self._formats: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        self.unparseable: Counter = Counter()
+
+    def parse(self, value: str, feed: str = '') -> Optional[datetime]:
+        """
+        Parse a date string into a naive UTC datetime.
+
+        Args:
+            value: Raw date string from the feed
+            feed: Key (usually the feed URL) the winning format is cached under
+
+        Returns:
+            Parsed datetime, or None if no known format matches
+        """
+        value = (value or '').strip()
+        if not value:
+            return None
+
+        cached = self._formats.get(feed)
+        if cached is not None:
+            try:
+                return to_naive_utc(DATE_FORMATS[cached](value))
+            except (TypeError, ValueError, IndexError):
+                pass
+
+        for name, parser in DATE_FORMATS.items():
+            if name == cached:
+                continue
+            try:
+                dt = parser(value)
+            except (TypeError, ValueError, IndexError):
+                continue
+            with self._lock:
+                self._formats[feed] = name
+            return to_naive_utc(dt)
+
+        with self._lock:
+            self.unparseable[feed] += 1
+        logger.debug(f"Could not parse date {value!r} from {feed or 'unknown feed'}")
+        return None
+
+    def parse_entry(self, entry: Mapping[str, Any], feed: str = '') -> Optional[datetime]:
+        """
+        Return the publication date of a feedparser entry as naive UTC.
+        """
+        for key in ('published_parsed', 'updated_parsed'):
+            parsed = entry.get(key)
+            if parsed:
+                try:
+                    return from_struct_time(parsed)
+                except (TypeError, ValueError):
+                    break
+        return self.parse(entry.get('published') or entry.get('updated', ''), feed)
+
+    def winning_format(self, feed: str) -> Optional[str]:
+        """
+        Name of the format learned for a feed, if any.
+        """
+        return self._formats.get(feed)
+
+# Shared parser used by utils.parse_date and the scrapers
+default_parser = DateParser()
\ No newline at end of file
@@ -0,0 +1,193 @@
+import hashlib
+import logging
+import math
+import os
+import re
+import sqlite3
+import threading
+from datetime import datetime, timezone
+from typing import Any, Iterable, List, Optional, Set
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INDEX_PATH = 'state/dedup.db'
+
+# Query parameters that only carry tracking information; anything else may
+# select the article (feeds pass IDs and sections as parameters)
+TRACKING_PREFIXES = ('utm_', 'ns_')
+TRACKING_PARAMS = {'cmp', 'maca'}
+
+_NON_WORD_RE = re.compile(r'\W+')
+
+def normalize_url(url: str) -> str:
+    """
+    Normalise an article URL so the same article linked with different
+    tracking parameters, schemes or fragments maps to one string.
+    """
+    url = (url or '').strip()
+    if not url:
+        return ''
+    parts = urlsplit(url)
+    host = parts.netloc.lower()
+    if host.startswith('www.'):
+        host = host[4:]
+    path = parts.path
+    if len(path) > 1:
+        path = path.rstrip('/')
+    query = sorted(
+        (key, value)
+        for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith(TRACKING_PREFIXES) and key.lower() not in TRACKING_PARAMS
+    )
+    return urlunsplit(('', host, path, urlencode(query), ''))
+
+def title_fingerprint(title: str) -> str:
+    """
+    Case- and punctuation-insensitive form of a title.
+    """
+    return _NON_WORD_RE.sub(' ', (title or '').casefold()).strip()
+
+def _digest(value: str) -> bytes:
+    return hashlib.blake2b(value.encode('utf-8'), digest_size=16).digest()
+
+def dedup_keys(url: str, title: str, source: str, published: Optional[datetime]) -> List[bytes]:
+    """
+    Index keys of an article: its normalised URL, and its title fingerprint
+    scoped to the source and publication day.
+    """
+    keys = []
+    normalized = normalize_url(url)
+    if normalized:
+        keys.append(_digest(f"u:{normalized}"))
+    fingerprint = title_fingerprint(title)
+    if fingerprint:
+        day = published.strftime('%Y-%m-%d') if published else ''
+        keys.append(_digest(f"t:{source}\x1f{day}\x1f{fingerprint}"))
+    return keys
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter over 16-byte digests.
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.01):
+        self.capacity = capacity
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, digest: bytes) -> Iterable[int]:
+        first = int.from_bytes(digest[:8], 'little')
+        second = int.from_bytes(digest[8:], 'little') | 1
+        for i in range(self.hashes):
+            yield (first + i * second) % self.size
+
+    def add(self, digest: bytes) -> None:
+        for position in self._positions(digest):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, digest: bytes) -> bool:
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(digest))
+
+class DedupIndex:
+    """
+    Persistent index of articles already collected, across runs and feeds.
+
+    An in-memory Bloom filter answers most lookups for new articles without
+    touching disk; possible hits are confirmed against the exact set of keys
+    kept in SQLite. Claimed keys only hold off duplicates within the run:
+    ``commit`` persists the keys passed to ``confirm`` by the sink once the
+    store has accepted the articles, so an entry that failed processing or
+    storing (or a crashed run) does not hide an article that was never
+    stored.
+    """
+
+    def __init__(self, path: str = DEFAULT_INDEX_PATH, capacity: int = 1000000):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._pending: Set[bytes] = set()
+        self._stored: Set[bytes] = set()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('CREATE TABLE IF NOT EXISTS seen (key BLOB PRIMARY KEY) WITHOUT ROWID')
+        count = self.conn.execute('SELECT COUNT(*) FROM seen').fetchone()[0]
+        self._build_bloom(max(capacity, count * 2))
+
+    def _build_bloom(self, capacity: int) -> None:
+        self.bloom = BloomFilter(capacity)
+        self._count = 0
+        for (key,) in self.conn.execute('SELECT key FROM seen'):
+            self.bloom.add(key)
+            self._count += 1
+
+    def _seen(self, key: bytes) -> bool:
+        if key not in self.bloom:
+            return False
+        if key in self._pending or key in self._stored:
+            return True
+        return self.conn.execute('SELECT 1 FROM seen WHERE key = ?', (key,)).fetchone() is not None
+
+    def claim(self, url: str, title: str, source: str, published: Optional[datetime] = None) -> bool:
+        """
+        Record an article and report whether it is new.
+
+        Returns:
+            False if the article (by URL or title fingerprint) was seen before
+        """
+        keys = dedup_keys(url, title, source, published)
+        with self._lock:
+            if any(self._seen(key) for key in keys):
+                return False
+            for key in keys:
+                self.bloom.add(key)
+                self._pending.add(key)
+            return True
+
+    def confirm(self, articles: Iterable[Any]) -> None:
+        """
+        Mark articles the store has accepted, to be persisted by ``commit``.
+
+        Keys are derived from the stored records (``url``, ``title``,
+        ``source`` and ``published`` epoch); cleaning only changes the title
+        fingerprint of titles with markup, whose URL key still matches.
+        """
+        with self._lock:
+            for article in articles:
+                published = datetime.fromtimestamp(article.published, timezone.utc).replace(tzinfo=None)
+                for key in dedup_keys(article.url, article.title, article.source, published):
+                    self.bloom.add(key)
+                    self._stored.add(key)
+
+    def commit(self) -> None:
+        """
+        Persist the keys confirmed since the last commit and forget the
+        claims of articles that were never stored, so later runs retry them.
+        """
+        with self._lock:
+            self._pending.clear()
+            if not self._stored:
+                return
+            with self.conn:
+                inserted = self.conn.executemany(
+                    'INSERT OR IGNORE INTO seen (key) VALUES (?)',
+                    [(key,) for key in self._stored]
+                ).rowcount
+            self._count += inserted
+            self._stored.clear()
+            if self._count > self.bloom.capacity:
+                logger.info(f"Growing dedup Bloom filter beyond {self.bloom.capacity} keys")
+                self._build_bloom(self._count * 2)
+
+    def close(self) -> None:
+        with self._lock:
+            self.conn.close()
+
+    def __enter__(self) -> 'DedupIndex':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -0,0 +1,197 @@
+import argparse
+import json
+import logging
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from metrics import FeedMetrics
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HEALTH_PATH = 'state/feed_health.json'
+
+# Consecutive failures before a feed's circuit opens
+FAILURE_THRESHOLD = 3
+
+# Wait before the first probe of an open circuit; doubles after every failed
+# probe up to MAX_PROBE_INTERVAL
+BASE_PROBE_INTERVAL = 60 * 60
+MAX_PROBE_INTERVAL = 7 * 24 * 60 * 60
+
+# Weight of the latest fetch in the moving averages
+SMOOTHING = 0.2
+
+# A feed without a success for this long is reported as dead
+DEAD_AFTER = 7 * 24 * 60 * 60
+
+NETWORK_STAGES = ('dns', 'connect', 'tls', 'ttfb', 'download')
+
+def _is_failure(feed_metrics: FeedMetrics) -> bool:
+    # Errors, and documents that parse to nothing, both mean no articles
+    return feed_metrics.error is not None or (feed_metrics.status == 200 and feed_metrics.entries_in == 0)
+
+def _format_time(timestamp: Optional[float]) -> str:
+    return datetime.fromtimestamp(timestamp).strftime('%Y-%m-%d %H:%M') if timestamp else 'never'
+
+class FeedHealthStore:
+    """
+    Persistent per-feed health with a circuit breaker.
+
+    Tracks consecutive failures, the last success, the rate of malformed
+    (bozo) documents and the average network latency of every feed. After
+    ``failure_threshold`` consecutive failures the feed's circuit opens and
+    it is skipped; once the probe interval has passed a single fetch is let
+    through. A successful probe closes the circuit, a failed one doubles the
+    interval, so dead sources cost one request per probe instead of a
+    timeout every run.
+    """
+
+    def __init__(
+        self,
+        path: str = DEFAULT_HEALTH_PATH,
+        failure_threshold: int = FAILURE_THRESHOLD,
+        base_probe_interval: float = BASE_PROBE_INTERVAL,
+        max_probe_interval: float = MAX_PROBE_INTERVAL
+    ):
+        self.path = path
+        self.failure_threshold = failure_threshold
+        self.base_probe_interval = base_probe_interval
+        self.max_probe_interval = max_probe_interval
+        self._lock = threading.Lock()
+        self._state: Dict[str, Dict[str, Any]] = self._load()
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable feed health {self.path}: {str(e)}")
+            return {}
+
+    def allow(self, url: str, now: Optional[float] = None) -> bool:
+        """
+        Whether a feed may be fetched: its circuit is closed, or open but due
+        for a probe.
+        """
+        now = now if now is not None else time.time()
+        with self._lock:
+            return self._state.get(url, {}).get('open_until', 0.0) <= now
+
+    def retry_at(self, url: str) -> float:
+        """
+        Time (epoch seconds) an open circuit lets the next probe through.
+        """
+        with self._lock:
+            return self._state.get(url, {}).get('open_until', 0.0)
+
+    def record(self, feed_metrics: FeedMetrics, now: Optional[float] = None) -> None:
+        """
+        Update a feed's health from the metrics of a completed fetch.
+        """
+        now = now if now is not None else time.time()
+        failed = _is_failure(feed_metrics)
+        latency = sum(feed_metrics.seconds.get(stage, 0.0) for stage in NETWORK_STAGES)
+
+        with self._lock:
+            state = self._state.setdefault(feed_metrics.url, {
+                'fetches': 0,
+                'consecutive_failures': 0,
+                'bozo_rate': 0.0,
+                'avg_latency': latency
+            })
+            state['fetches'] += 1
+            state['bozo_rate'] = SMOOTHING * feed_metrics.bozo + (1 - SMOOTHING) * state['bozo_rate']
+            state['avg_latency'] = SMOOTHING * latency + (1 - SMOOTHING) * state['avg_latency']
+            state['last_status'] = feed_metrics.status
+
+            if not failed:
+                if state.get('open_until'):
+                    logger.info(f"Feed recovered, closing its circuit: {feed_metrics.url}")
+                state['consecutive_failures'] = 0
+                state['last_success'] = now
+                state.pop('open_until', None)
+                state.pop('last_error', None)
+                return
+
+            state['consecutive_failures'] += 1
+            state['last_failure'] = now
+            state['last_error'] = feed_metrics.error or 'no entries'
+            excess = state['consecutive_failures'] - self.failure_threshold
+            if excess >= 0:
+                interval = min(self.base_probe_interval * 2 ** min(excess, 32), self.max_probe_interval)
+                state['open_until'] = now + interval
+                logger.warning(
+                    f"Circuit open for {feed_metrics.url} after {state['consecutive_failures']} "
+                    f"consecutive failures; next probe at {_format_time(state['open_until'])}"
+                )
+
+    def dead_feeds(self, feeds: List[Dict[str, str]], now: Optional[float] = None) -> List[Dict[str, Any]]:
+        """
+        Feeds whose circuit is open or that have not succeeded within
+        ``DEAD_AFTER``, worst first.
+        """
+        now = now if now is not None else time.time()
+        report = []
+        with self._lock:
+            for feed_info in feeds:
+                state = self._state.get(feed_info['url'])
+                if not state:
+                    continue
+                last_success = state.get('last_success')
+                stale = state.get('consecutive_failures', 0) > 0 and (
+                    last_success is not None and now - last_success > DEAD_AFTER
+                )
+                if not state.get('open_until') and not stale:
+                    continue
+                report.append({**feed_info, **state})
+        return sorted(report, key=lambda row: (-row['consecutive_failures'], row.get('last_success') or 0))
+
+    def save(self) -> None:
+        """
+        Persist the health state atomically.
+        """
+        with self._lock:
+            data = {url: dict(state) for url, state in self._state.items()}
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=2, sort_keys=True)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.error(f"Error saving feed health to {self.path}: {str(e)}")
+
+def main() -> None:
+    """
+    Print the dead-feed report.
+    """
+    from rss_links import RSS_FEEDS
+
+    parser = argparse.ArgumentParser(description="Report feeds that keep failing")
+    parser.add_argument('--health', default=DEFAULT_HEALTH_PATH, help="Path of the feed health file")
+    args = parser.parse_args()
+
+    dead = FeedHealthStore(args.health).dead_feeds(RSS_FEEDS)
+    if not dead:
+        print("No dead feeds.")
+        return
+    print(f"{len(dead)} dead or quarantined feeds:")
+    for row in dead:
+        print(
+            f"- {row['country']} / {row['agency']}: {row['consecutive_failures']} consecutive failures, "
+            f"last success {_format_time(row.get('last_success'))}, "
+            f"next probe {_format_time(row.get('open_until'))}, "
+            f"bozo rate {row['bozo_rate']:.0%}, avg latency {row['avg_latency']:.2f}s\n"
+            f"  {row['url']}\n"
+            f"  {row.get('last_error', '')}"
+        )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+import json
+import logging
+import os
+import threading
+from typing import Dict, Mapping
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_STATE_PATH = 'state/feed_state.json'
+
+class FeedStateStore:
+    """
+    Small JSON-backed store of per-feed HTTP validators.
+
+    Keeps the ``ETag`` and ``Last-Modified`` headers returned for each feed URL
+    so the next fetch can be made conditional and answered with a 304.
+    """
+
+    def __init__(self, path: str = DEFAULT_STATE_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._state: Dict[str, Dict[str, str]] = self._load()
+
+    def _load(self) -> Dict[str, Dict[str, str]]:
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable feed state {self.path}: {str(e)}")
+            return {}
+
+    def conditional_headers(self, url: str) -> Dict[str, str]:
+        """
+        Return the If-None-Match / If-Modified-Since headers for a feed.
+        """
+        with self._lock:
+            validators = self._state.get(url, {})
+            headers = {}
+            if validators.get('etag'):
+                headers['If-None-Match'] = validators['etag']
+            if validators.get('last_modified'):
+                headers['If-Modified-Since'] = validators['last_modified']
+            return headers
+
+    def update(self, url: str, response_headers: Mapping[str, str]) -> None:
+        """
+        Remember the validators from a successful (200) response.
+        """
+        validators = {}
+        if response_headers.get('ETag'):
+            validators['etag'] = response_headers['ETag']
+        if response_headers.get('Last-Modified'):
+            validators['last_modified'] = response_headers['Last-Modified']
+
+        with self._lock:
+            if validators:
+                self._state[url] = validators
+            else:
+                self._state.pop(url, None)
+
+    def save(self) -> None:
+        """
+        Persist the store atomically.
+        """
+        with self._lock:
+            data = dict(self._state)
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=2, sort_keys=True)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.error(f"Error saving feed state to {self.path}: {str(e)}")
@@ -0,0 +1,200 @@
+import socket
+import threading
+import time
+from typing import Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import ConnectTimeoutError, NameResolutionError, NewConnectionError
+from urllib3.util import Retry, make_headers
+from urllib3.util.connection import allowed_gai_family
+
+import metrics
+from metrics import FeedMetrics
+from rate_limit import host_of
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+}
+
+class _TimedConnectionMixin:
+    """
+    Reports DNS, TCP connect and TLS handshake times of new connections to
+    the metrics of the feed being fetched on the current thread.
+    """
+
+    def _new_conn(self):
+        feed_metrics = metrics.current()
+        if feed_metrics is None:
+            return super()._new_conn()
+
+        # Resolve once, timed, then let urllib3 connect to each address in
+        # turn, keeping create_connection's fallback across all of them
+        started = time.perf_counter()
+        try:
+            addresses = socket.getaddrinfo(self._dns_host, self.port, allowed_gai_family(), socket.SOCK_STREAM)
+        except socket.gaierror as e:
+            raise NameResolutionError(self.host, self, e) from e
+        finally:
+            feed_metrics.add_time('dns', time.perf_counter() - started)
+
+        resolved = time.perf_counter()
+        dns_host = self._dns_host
+        try:
+            addresses = list(dict.fromkeys(address[4][0] for address in addresses))
+            for index, address in enumerate(addresses):
+                self._dns_host = address
+                try:
+                    return super()._new_conn()
+                except (ConnectTimeoutError, NewConnectionError):
+                    if index == len(addresses) - 1:
+                        raise
+            raise NewConnectionError(self, f"Failed to establish a new connection: no address for {self.host}")
+        finally:
+            self._dns_host = dns_host
+            feed_metrics.add_time('connect', time.perf_counter() - resolved)
+
+    def connect(self) -> None:
+        feed_metrics = metrics.current()
+        if feed_metrics is None:
+            return super().connect()
+
+        started = time.perf_counter()
+        before = feed_metrics.seconds['dns'] + feed_metrics.seconds['connect']
+        try:
+            super().connect()
+        finally:
+            elapsed = time.perf_counter() - started
+            socket_setup = feed_metrics.seconds['dns'] + feed_metrics.seconds['connect'] - before
+            if isinstance(self, HTTPSConnection):
+                feed_metrics.add_time('tls', max(0.0, elapsed - socket_setup))
+
+class _TimedHTTPConnection(_TimedConnectionMixin, HTTPConnection):
+    pass
+
+class _TimedHTTPSConnection(_TimedConnectionMixin, HTTPSConnection):
+    pass
+
+class _TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _TimedHTTPConnection
+
+class _TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _TimedHTTPSConnection
+
+class _TimedHTTPAdapter(HTTPAdapter):
+    def init_poolmanager(self, *args, **kwargs) -> None:
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': _TimedHTTPConnectionPool,
+            'https': _TimedHTTPSConnectionPool
+        }
+
+class FeedSession:
+    """
+    Pooled HTTP session shared by all fetches of a scraping run.
+
+    Wraps a ``requests.Session`` so connections are kept alive and reused per
+    host, responses are negotiated as gzip (and brotli when the ``brotli``
+    package is installed), transient connection errors and 5xx responses are
+    retried with exponential backoff (429 and ``Retry-After`` are returned to
+    the caller, which reschedules the feed), and at most ``max_per_host`` requests
+    are in flight to any single host. Fetches can report their network
+    timings and byte counts into a ``FeedMetrics``.
+    """
+
+    def __init__(
+        self,
+        max_per_host: int = 2,
+        retries: int = 3,
+        backoff_factor: float = 0.5,
+        timeout: float = 30,
+        pool_connections: int = 32
+    ):
+        self.max_per_host = max_per_host
+        self.timeout = timeout
+        self._semaphores: Dict[str, threading.BoundedSemaphore] = {}
+        self._lock = threading.Lock()
+
+        retry = Retry(
+            total=retries,
+            connect=retries,
+            read=retries,
+            status=retries,
+            status_forcelist=(500, 502, 503, 504),
+            allowed_methods=frozenset(['GET', 'HEAD']),
+            backoff_factor=backoff_factor,
+            # Retry-After is handled by the poll schedule; honouring it here
+            # would sleep (uncapped) while holding the host's slot
+            respect_retry_after_header=False,
+            raise_on_status=False
+        )
+        adapter = _TimedHTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=max_per_host,
+            max_retries=retry
+        )
+
+        self.session = requests.Session()
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.session.headers.update(DEFAULT_HEADERS)
+        # Advertises brotli only when urllib3 is able to decode it
+        self.session.headers.update(make_headers(accept_encoding=True))
+
+    def _semaphore(self, url: str) -> threading.BoundedSemaphore:
+        host = host_of(url)
+        with self._lock:
+            if host not in self._semaphores:
+                self._semaphores[host] = threading.BoundedSemaphore(self.max_per_host)
+            return self._semaphores[host]
+
+    def get(
+        self,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: Optional[float] = None,
+        feed_metrics: Optional[FeedMetrics] = None
+    ) -> requests.Response:
+        """
+        Issue a GET request, waiting for a free slot on the target host.
+
+        The body is read before returning. With ``feed_metrics``, the time to
+        the response headers (excluding connection setup), the download time,
+        the status and the bytes received are recorded.
+        """
+        with self._semaphore(url), metrics.activate(feed_metrics):
+            setup_before = self._setup_seconds(feed_metrics)
+            started = time.perf_counter()
+            response = self.session.get(
+                url,
+                headers=headers,
+                timeout=timeout if timeout is not None else self.timeout,
+                stream=True
+            )
+            headers_at = time.perf_counter()
+            content = response.content
+            if feed_metrics is not None:
+                setup = self._setup_seconds(feed_metrics) - setup_before
+                feed_metrics.add_time('ttfb', max(0.0, headers_at - started - setup))
+                feed_metrics.add_time('download', time.perf_counter() - headers_at)
+                feed_metrics.status = response.status_code
+                feed_metrics.bytes_received += response.raw.tell() or len(content)
+                feed_metrics.bytes_decoded += len(content)
+            return response
+
+    @staticmethod
+    def _setup_seconds(feed_metrics: Optional[FeedMetrics]) -> float:
+        if feed_metrics is None:
+            return 0.0
+        return sum(feed_metrics.seconds[stage] for stage in ('dns', 'connect', 'tls'))
+
+    def close(self) -> None:
+        self.session.close()
+
+    def __enter__(self) -> 'FeedSession':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
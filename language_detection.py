@@ -0,0 +1,189 @@
+import hashlib
+import logging
+import multiprocessing
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from types import ModuleType
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+UNKNOWN = 'unknown'
+
+_langdetect: Optional[ModuleType] = None
+
+def _load() -> ModuleType:
+    """
+    langdetect, imported on first detection so that runs which detect
+    nothing (unchanged feeds, declared languages) never load it.
+    """
+    global _langdetect
+    if _langdetect is None:
+        import langdetect
+
+        # langdetect is randomised; a fixed seed makes results reproducible
+        langdetect.DetectorFactory.seed = 0
+        _langdetect = langdetect
+    return _langdetect
+
+def _detect(text: str) -> Tuple[str, float]:
+    """
+    Most probable language of ``text`` and its probability.
+    """
+    langdetect = _load()
+    try:
+        best = langdetect.detect_langs(text)[0]
+        return best.lang, best.prob
+    except (langdetect.LangDetectException, IndexError):
+        return UNKNOWN, 0.0
+
+def _seed_worker() -> None:
+    _load()
+
+class LanguageDetector:
+    """
+    Language detection stage for feed entries.
+
+    Results are cached by a hash of the text. Once ``min_samples`` confident
+    detections (probability >= ``confidence_threshold``) of a feed agree on
+    one language, that feed is considered single-language and later entries
+    are labelled without running detection; a declared language short-cuts
+    detection from the start. Batches can be spread over a process pool.
+    """
+
+    def __init__(
+        self,
+        confidence_threshold: float = 0.9,
+        min_samples: int = 20,
+        cache_size: int = 100000,
+        processes: int = 0
+    ):
+        self.confidence_threshold = confidence_threshold
+        self.min_samples = min_samples
+        self.cache_size = cache_size
+        self.processes = processes
+        self._cache: 'OrderedDict[bytes, Tuple[str, float]]' = OrderedDict()
+        self._streaks: Dict[str, Tuple[str, int]] = {}
+        self._learned: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    @staticmethod
+    def _key(text: str) -> bytes:
+        return hashlib.blake2b(text.encode('utf-8'), digest_size=16).digest()
+
+    def _cached(self, key: bytes) -> Optional[Tuple[str, float]]:
+        with self._lock:
+            result = self._cache.get(key)
+            if result is not None:
+                self._cache.move_to_end(key)
+            return result
+
+    def _store(self, key: bytes, result: Tuple[str, float]) -> None:
+        with self._lock:
+            self._cache[key] = result
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def _learn(self, feed: str, result: Tuple[str, float]) -> None:
+        language, probability = result
+        if not feed or language == UNKNOWN or probability < self.confidence_threshold:
+            return
+        with self._lock:
+            current, count = self._streaks.get(feed, (language, 0))
+            count = count + 1 if current == language else 1
+            self._streaks[feed] = (language, count)
+            if count >= self.min_samples and feed not in self._learned:
+                self._learned[feed] = language
+                logger.info(f"Learned language '{language}' for {feed}")
+
+    def feed_language(self, feed: str) -> Optional[str]:
+        """
+        Language learned for a feed, if detection has settled on one.
+        """
+        return self._learned.get(feed)
+
+    def detect(self, text: str) -> Tuple[str, float]:
+        """
+        Detect the language of a single text, using the cache.
+        """
+        if not text or not text.strip():
+            return UNKNOWN, 0.0
+        key = self._key(text)
+        result = self._cached(key)
+        if result is None:
+            result = _detect(text)
+            self._store(key, result)
+        return result
+
+    def detect_batch(
+        self,
+        texts: List[str],
+        feed: str = '',
+        declared: Optional[str] = None
+    ) -> List[str]:
+        """
+        Detect the languages of a batch of texts from one feed.
+
+        Args:
+            texts: Texts to label (typically title and description)
+            feed: Key (usually the feed URL) used to learn the feed's language
+            declared: Language configured for the feed, skips detection
+
+        Returns:
+            Language code for each text, in order
+        """
+        language = declared or self.feed_language(feed)
+        if language:
+            return [language] * len(texts)
+
+        if self.processes > 1 and len(texts) > 1:
+            results = self._detect_parallel(texts)
+            for result in results:
+                self._learn(feed, result)
+            return [result[0] for result in results]
+
+        languages = []
+        for text in texts:
+            language = self.feed_language(feed)
+            if not language:
+                result = self.detect(text)
+                self._learn(feed, result)
+                language = result[0]
+            languages.append(language)
+        return languages
+
+    def _detect_parallel(self, texts: List[str]) -> List[Tuple[str, float]]:
+        keys = [self._key(text) for text in texts]
+        results: List[Optional[Tuple[str, float]]] = [self._cached(key) for key in keys]
+        missing = [index for index, result in enumerate(results) if result is None]
+
+        if missing:
+            if self._executor is None:
+                # Not forked: the scraper's threads may hold locks at fork time
+                methods = multiprocessing.get_all_start_methods()
+                context = multiprocessing.get_context('forkserver' if 'forkserver' in methods else 'spawn')
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.processes,
+                    mp_context=context,
+                    initializer=_seed_worker
+                )
+            chunksize = max(1, len(missing) // (self.processes * 4))
+            detected = self._executor.map(_detect, [texts[i] for i in missing], chunksize=chunksize)
+            for index, result in zip(missing, detected):
+                self._store(keys[index], result)
+                results[index] = result
+
+        return results
+
+    def close(self) -> None:
+        """
+        Shut down the process pool, if one was started.
+        """
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+# Shared detector used by the scrapers
+default_detector = LanguageDetector()
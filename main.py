@@ -3,6 +3,7 @@ import os
 os.makedirs('data', exist_ok=True)
 os.makedirs('logs', exist_ok=True)
 
+import argparse
 import logging
 from datetime import datetime
 from rss_links import RSS_FEEDS
@@ -20,13 +21,30 @@ logging.basicConfig(
 
 logger = logging.getLogger(__name__)
 
-def main():
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Collect news articles from RSS feeds")
+    parser.add_argument('--historical', action='store_true',
+                        help="Backfill past days via the feeds' date parameter (resumable)")
+    parser.add_argument('--days', type=int, default=365,
+                        help="Number of days to backfill with --historical")
+    parser.add_argument('--format', choices=['csv', 'json', 'parquet'], default='csv',
+                        help="Export format of the collected articles")
+    parser.add_argument('--parse-workers', type=int, default=0,
+                        help="Processes parsing and normalising feed documents (0: parse in the fetch threads)")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
     try:
         logger.info("Starting RSS feed scraping...")
         logger.info(f"Total feeds to process: {len(RSS_FEEDS)}")
         
-        # Scrape all feeds and save as CSV
-        scrape_all_feeds(RSS_FEEDS, output_format='csv')
+        if args.historical:
+            # Imported here so regular runs do not load the backfill machinery
+            from backfill import backfill_feeds
+            backfill_feeds(RSS_FEEDS, days=args.days, output_format=args.format)
+        else:
+            scrape_all_feeds(RSS_FEEDS, output_format=args.format, parse_workers=args.parse_workers)
         
         logger.info("RSS feed scraping completed successfully!")
         
@@ -0,0 +1,211 @@
+import json
+import logging
+import os
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Files written after every run: Prometheus text format and a JSON summary
+DEFAULT_METRICS_PATHS = ('logs/metrics.prom', 'logs/run_summary.json')
+
+# Timed stages of one feed fetch, in pipeline order:
+# wait is the per-host politeness delay, dns/connect/tls only occur when a new
+# connection is opened, ttfb is the wait for the response headers once
+# connected, store is the time spent in the sink
+STAGES = (
+    'wait', 'dns', 'connect', 'tls', 'ttfb', 'download',
+    'parse', 'date', 'dedup', 'clean', 'language', 'store'
+)
+
+_local = threading.local()
+
+class FeedMetrics:
+    """
+    Timings and counters of one feed fetch.
+    """
+
+    def __init__(self, feed_info: Dict[str, str]):
+        self.url = feed_info['url']
+        self.source = feed_info.get('agency', '')
+        self.country = feed_info.get('country', '')
+        self.started_at = time.time()
+        self.seconds: Dict[str, float] = dict.fromkeys(STAGES, 0.0)
+        self.total_seconds = 0.0
+        self.status: Optional[int] = None
+        self.bytes_received = 0
+        self.bytes_decoded = 0
+        self.entries_in = 0
+        self.entries_out = 0
+        self.dropped: Counter = Counter()
+        self.bozo = False
+        self.error: Optional[str] = None
+
+    def add_time(self, stage: str, seconds: float) -> None:
+        self.seconds[stage] = self.seconds.get(stage, 0.0) + seconds
+
+    @contextmanager
+    def timer(self, stage: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(stage, time.perf_counter() - started)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            'url': self.url,
+            'source': self.source,
+            'country': self.country,
+            'started_at': datetime.fromtimestamp(self.started_at).isoformat(timespec='seconds'),
+            'status': self.status,
+            'bytes_received': self.bytes_received,
+            'bytes_decoded': self.bytes_decoded,
+            'entries_in': self.entries_in,
+            'entries_out': self.entries_out,
+            'dropped': dict(self.dropped),
+            'bozo': self.bozo,
+            'total_seconds': round(self.total_seconds, 6),
+            'seconds': {stage: round(value, 6) for stage, value in self.seconds.items()},
+            'error': self.error
+        }
+
+def current() -> Optional[FeedMetrics]:
+    """
+    Metrics of the feed being fetched on this thread, if any.
+    """
+    return getattr(_local, 'metrics', None)
+
+@contextmanager
+def activate(metrics: Optional[FeedMetrics]) -> Iterator[None]:
+    """
+    Make ``metrics`` the current feed's metrics on this thread, so layers
+    without access to it (the connection pool) can report into it.
+    """
+    previous = current()
+    _local.metrics = metrics
+    try:
+        yield
+    finally:
+        _local.metrics = previous
+
+def _label(value: Any) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+class RunMetrics:
+    """
+    Per-feed metrics of a scraping run, exportable as Prometheus text format
+    or as a JSON run summary.
+
+    Only the latest fetch of each feed is kept, so a long-running scheduler
+    can reuse one instance.
+    """
+
+    def __init__(self):
+        self.started_at = time.time()
+        self._lock = threading.Lock()
+        self._feeds: Dict[str, FeedMetrics] = {}
+
+    def feed(self, feed_info: Dict[str, str]) -> FeedMetrics:
+        """
+        Start recording a fetch of ``feed_info``.
+        """
+        metrics = FeedMetrics(feed_info)
+        with self._lock:
+            self._feeds[metrics.url] = metrics
+        return metrics
+
+    def feeds(self) -> List[FeedMetrics]:
+        with self._lock:
+            return list(self._feeds.values())
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        JSON-serialisable run summary: totals per stage and per-feed records.
+        """
+        feeds = self.feeds()
+        stage_totals = dict.fromkeys(STAGES, 0.0)
+        for metrics in feeds:
+            for stage, value in metrics.seconds.items():
+                stage_totals[stage] = stage_totals.get(stage, 0.0) + value
+        return {
+            'started_at': datetime.fromtimestamp(self.started_at).isoformat(timespec='seconds'),
+            'duration_seconds': round(time.time() - self.started_at, 3),
+            'feeds': len(feeds),
+            'failed_feeds': sum(1 for metrics in feeds if metrics.error),
+            'bytes_received': sum(metrics.bytes_received for metrics in feeds),
+            'entries_in': sum(metrics.entries_in for metrics in feeds),
+            'entries_out': sum(metrics.entries_out for metrics in feeds),
+            'stage_seconds': {stage: round(value, 6) for stage, value in stage_totals.items()},
+            'slowest_feeds': [
+                metrics.url for metrics in sorted(feeds, key=lambda m: m.total_seconds, reverse=True)[:10]
+            ],
+            'per_feed': [metrics.as_dict() for metrics in feeds]
+        }
+
+    def to_prometheus(self) -> str:
+        """
+        Render the metrics in the Prometheus text exposition format.
+        """
+        feeds = self.feeds()
+        lines = []
+
+        def family(name: str, kind: str, help_text: str, samples: List[str]) -> None:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            lines.extend(samples)
+
+        def labels(metrics: FeedMetrics, **extra: str) -> str:
+            pairs = {'feed': metrics.url, 'source': metrics.source, 'country': metrics.country, **extra}
+            return '{' + ','.join(f'{key}="{_label(value)}"' for key, value in pairs.items()) + '}'
+
+        family('rss_feed_stage_seconds', 'gauge', 'Time spent per feed and stage in the last fetch.', [
+            f"rss_feed_stage_seconds{labels(metrics, stage=stage)} {value:.6f}"
+            for metrics in feeds for stage, value in metrics.seconds.items()
+        ])
+        family('rss_feed_duration_seconds', 'gauge', 'Wall time of the last fetch of a feed.', [
+            f"rss_feed_duration_seconds{labels(metrics)} {metrics.total_seconds:.6f}" for metrics in feeds
+        ])
+        family('rss_feed_bytes_received', 'gauge', 'Bytes received on the wire in the last fetch.', [
+            f"rss_feed_bytes_received{labels(metrics)} {metrics.bytes_received}" for metrics in feeds
+        ])
+        family('rss_feed_entries', 'gauge', 'Entries parsed (in) and emitted (out) in the last fetch.', [
+            f"rss_feed_entries{labels(metrics, direction=direction)} {count}"
+            for metrics in feeds
+            for direction, count in (('in', metrics.entries_in), ('out', metrics.entries_out))
+        ])
+        family('rss_feed_dropped_entries', 'gauge', 'Entries dropped per filter stage in the last fetch.', [
+            f"rss_feed_dropped_entries{labels(metrics, reason=reason)} {count}"
+            for metrics in feeds for reason, count in metrics.dropped.items()
+        ])
+        family('rss_feed_http_status', 'gauge', 'HTTP status of the last fetch (0 if no response).', [
+            f"rss_feed_http_status{labels(metrics)} {metrics.status or 0}" for metrics in feeds
+        ])
+        family('rss_feed_up', 'gauge', 'Whether the last fetch of a feed succeeded.', [
+            f"rss_feed_up{labels(metrics)} {0 if metrics.error else 1}" for metrics in feeds
+        ])
+        family('rss_feed_last_fetch_timestamp_seconds', 'gauge', 'Start time of the last fetch of a feed.', [
+            f"rss_feed_last_fetch_timestamp_seconds{labels(metrics)} {metrics.started_at:.3f}" for metrics in feeds
+        ])
+        return '\n'.join(lines) + '\n'
+
+    def write(self, path: str) -> None:
+        """
+        Atomically write the metrics to ``path``: Prometheus text format for
+        ``.prom`` files, a JSON run summary otherwise.
+        """
+        content = self.to_prometheus() if path.endswith('.prom') else json.dumps(self.summary(), indent=2)
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(content)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.error(f"Error writing metrics to {path}: {str(e)}")
@@ -0,0 +1,132 @@
+import logging
+import multiprocessing
+import os
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from article import Article
+
+logger = logging.getLogger(__name__)
+
+# Raw fields of an entry that survived the date cutoff:
+# (link, title, raw description, published)
+RawItem = Tuple[str, str, str, datetime]
+
+class ParsedDocument(NamedTuple):
+    """
+    Compact result of parsing one feed document in a worker.
+    """
+    received: int
+    bozo_exception: Optional[str]
+    interval_hint: Optional[float]
+    items: List[RawItem]
+    drops: Counter
+    seconds: Dict[str, float]
+
+class NormalizedBatch(NamedTuple):
+    """
+    Compact result of cleaning and tagging a batch of entries in a worker.
+    """
+    articles: List[Article]
+    drops: Counter
+    seconds: Dict[str, float]
+
+# Scrapers of the worker process, one per feed, so per-feed learned state
+# (date formats, languages) survives between documents
+_scrapers: Dict[str, Any] = {}
+
+def _worker_scraper(feed_info: Dict[str, str]):
+    from metrics import FeedMetrics
+    from scraper import RSSScraper
+
+    scraper = _scrapers.get(feed_info['url'])
+    if scraper is None:
+        scraper = _scrapers[feed_info['url']] = RSSScraper(feed_info)
+    scraper.metrics = FeedMetrics(feed_info)
+    return scraper
+
+def _parse_document(
+    feed_info: Dict[str, str],
+    content: bytes,
+    start_date: Optional[datetime],
+    end_date: Optional[datetime]
+) -> ParsedDocument:
+    import feedparser
+    from poll_schedule import feed_interval_hint
+    from scraper import entry_description
+
+    scraper = _worker_scraper(feed_info)
+    with scraper.metrics.timer('parse'):
+        feed = feedparser.parse(content)
+    drops: Counter = Counter()
+    items = [
+        (entry.get('link', ''), entry.get('title', ''), entry_description(entry), published)
+        for entry, published in scraper._filter_by_date(feed.entries, start_date, end_date, drops)
+    ]
+    return ParsedDocument(
+        received=len(feed.entries),
+        bozo_exception=str(feed.bozo_exception) if feed.bozo else None,
+        interval_hint=feed_interval_hint(feed.feed),
+        items=items,
+        drops=drops,
+        seconds=scraper.metrics.seconds
+    )
+
+def _normalize(feed_info: Dict[str, str], items: List[RawItem]) -> NormalizedBatch:
+    scraper = _worker_scraper(feed_info)
+    drops: Counter = Counter()
+    pairs = (
+        ({'link': link, 'title': title, 'description': description}, published)
+        for link, title, description, published in items
+    )
+    entries = scraper._tag_language(scraper._clean(pairs, drops))
+    return NormalizedBatch(
+        articles=list(entries),
+        drops=drops,
+        seconds=scraper.metrics.seconds
+    )
+
+class ParsePool:
+    """
+    Process pool for the CPU-bound part of feed processing.
+
+    ``feedparser`` and the per-entry cleaning and language detection hold
+    the GIL, so with many fetch threads they run one at a time. Here the raw
+    response bytes go to worker processes: ``parse`` returns the entries
+    that passed the date cutoff as compact tuples, and ``normalize`` cleans
+    and tags the ones the caller has not collected before. Only these
+    tuples and ``Article`` records cross the process boundary, never
+    feedparser's entry objects.
+    """
+
+    def __init__(self, processes: Optional[int] = None):
+        self.processes = processes or os.cpu_count() or 1
+        # Workers start on first use, from the fetch threads; forking a
+        # process whose other threads hold logging, urllib3 or SQLite locks
+        # can deadlock the children, so they come from a clean process
+        methods = multiprocessing.get_all_start_methods()
+        context = multiprocessing.get_context('forkserver' if 'forkserver' in methods else 'spawn')
+        self._executor = ProcessPoolExecutor(max_workers=self.processes, mp_context=context)
+
+    def parse(
+        self,
+        feed_info: Dict[str, str],
+        content: bytes,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None
+    ) -> ParsedDocument:
+        return self._executor.submit(_parse_document, feed_info, content, start_date, end_date).result()
+
+    def normalize(self, feed_info: Dict[str, str], items: List[RawItem]) -> NormalizedBatch:
+        return self._executor.submit(_normalize, feed_info, items).result()
+
+    def close(self) -> None:
+        self._executor.shutdown()
+
+    def __enter__(self) -> 'ParsePool':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
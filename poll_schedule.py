@@ -0,0 +1,216 @@
+import json
+import logging
+import os
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, List, Mapping, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SCHEDULE_PATH = 'state/poll_schedule.json'
+
+# Bounds of the adaptive polling interval, in seconds
+MIN_INTERVAL = 5 * 60
+MAX_INTERVAL = 6 * 60 * 60
+DEFAULT_INTERVAL = 30 * 60
+
+# Poll a feed about when this many new items are expected to be waiting,
+# well inside the 20-50 item window most feeds publish
+TARGET_NEW_ITEMS = 5
+
+# Weight of the latest observation in the smoothed new-item rate
+RATE_SMOOTHING = 0.3
+
+# Interval growth after a poll that found nothing new
+IDLE_BACKOFF = 1.5
+
+# Seconds per sy:updatePeriod unit (RSS syndication module)
+UPDATE_PERIODS = {
+    'hourly': 60 * 60,
+    'daily': 24 * 60 * 60,
+    'weekly': 7 * 24 * 60 * 60,
+    'monthly': 30 * 24 * 60 * 60,
+    'yearly': 365 * 24 * 60 * 60
+}
+
+def feed_interval_hint(feed: Mapping[str, Any]) -> Optional[float]:
+    """
+    Minimum polling interval a feed asks for, in seconds.
+
+    Uses the RSS ``<ttl>`` (minutes) and the syndication module's
+    ``sy:updatePeriod`` / ``sy:updateFrequency``; the longer one wins.
+    """
+    hints = []
+    try:
+        if feed.get('ttl'):
+            hints.append(float(feed['ttl']) * 60)
+    except (TypeError, ValueError):
+        pass
+
+    period = UPDATE_PERIODS.get(str(feed.get('sy_updateperiod', '')).strip().lower())
+    if period:
+        try:
+            frequency = max(1, int(feed.get('sy_updatefrequency') or 1))
+        except (TypeError, ValueError):
+            frequency = 1
+        hints.append(period / frequency)
+
+    return max(hints) if hints else None
+
+def parse_retry_after(value: Optional[str], now: Optional[float] = None) -> Optional[float]:
+    """
+    Seconds to wait according to a ``Retry-After`` header (delay or HTTP date).
+    """
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError, IndexError):
+        return None
+    return max(0.0, retry_at - (now if now is not None else time.time()))
+
+class PollSchedule:
+    """
+    Persistent per-feed polling schedule.
+
+    Every feed has its own next-due time. After each poll the interval is
+    re-derived from a smoothed rate of new items per hour, so a feed is
+    polled about when ``target_items`` new articles are expected; feeds that
+    stay quiet back off towards ``max_interval``. Publisher hints are
+    honoured: ``<ttl>`` and ``sy:updatePeriod`` set a floor on the interval,
+    and a ``Retry-After`` answer postpones the next poll.
+    """
+
+    def __init__(
+        self,
+        path: str = DEFAULT_SCHEDULE_PATH,
+        min_interval: float = MIN_INTERVAL,
+        max_interval: float = MAX_INTERVAL,
+        default_interval: float = DEFAULT_INTERVAL,
+        target_items: float = TARGET_NEW_ITEMS
+    ):
+        self.path = path
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.default_interval = default_interval
+        self.target_items = target_items
+        self._lock = threading.Lock()
+        self._state: Dict[str, Dict[str, float]] = self._load()
+
+    def _load(self) -> Dict[str, Dict[str, float]]:
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable poll schedule {self.path}: {str(e)}")
+            return {}
+
+    def _feed(self, url: str) -> Dict[str, float]:
+        return self._state.setdefault(url, {'interval': self.default_interval, 'rate': 0.0})
+
+    def next_due(self, url: str) -> float:
+        """
+        Time (epoch seconds) a feed is next due; feeds never polled are due now.
+        """
+        with self._lock:
+            return self._state.get(url, {}).get('next_due', 0.0)
+
+    def due(self, urls: List[str], now: Optional[float] = None) -> List[str]:
+        """
+        The feeds of ``urls`` that are due, most overdue first.
+        """
+        now = now if now is not None else time.time()
+        with self._lock:
+            due = [(self._state.get(url, {}).get('next_due', 0.0), url) for url in urls]
+        return [url for next_due, url in sorted(due) if next_due <= now]
+
+    def observe_interval_hint(self, url: str, hint: Optional[float]) -> None:
+        """
+        Record the minimum interval a feed document asks for (None if it has none).
+        """
+        with self._lock:
+            state = self._feed(url)
+            if hint:
+                state['interval_hint'] = hint
+            else:
+                state.pop('interval_hint', None)
+
+    def observe_retry_after(self, url: str, seconds: float) -> None:
+        """
+        Record a ``Retry-After`` answer; the next poll is postponed accordingly.
+        """
+        with self._lock:
+            self._feed(url)['retry_until'] = time.time() + seconds
+
+    def postpone(self, url: str, until: float) -> None:
+        """
+        Move a feed's next poll to ``until`` (epoch seconds) without recording a poll.
+        """
+        with self._lock:
+            state = self._feed(url)
+            state['next_due'] = max(state.get('next_due', 0.0), until)
+
+    def record(self, url: str, new_items: int, now: Optional[float] = None) -> float:
+        """
+        Record a completed poll and schedule the next one.
+
+        Args:
+            url: Feed URL
+            new_items: Number of articles the poll found that were not
+                collected before
+            now: Time the poll completed (default: current time)
+
+        Returns:
+            Time (epoch seconds) the feed is next due
+        """
+        now = now if now is not None else time.time()
+        with self._lock:
+            state = self._feed(url)
+            last_polled = state.get('last_polled')
+            if last_polled is not None and now > last_polled:
+                observed = new_items / ((now - last_polled) / 3600)
+                state['rate'] = RATE_SMOOTHING * observed + (1 - RATE_SMOOTHING) * state['rate']
+
+            if last_polled is None:
+                # The first poll collects a whole backlog, not a rate
+                interval = self.default_interval
+            elif state['rate'] > 0:
+                interval = self.target_items / state['rate'] * 3600
+            else:
+                interval = state['interval'] * IDLE_BACKOFF
+            interval = min(max(interval, self.min_interval), self.max_interval)
+
+            hint = state.get('interval_hint')
+            if hint:
+                interval = max(interval, hint)
+
+            next_due = now + interval
+            retry_until = state.pop('retry_until', None)
+            if retry_until is not None:
+                next_due = max(next_due, retry_until)
+
+            state.update(interval=interval, last_polled=now, next_due=next_due)
+            return next_due
+
+    def save(self) -> None:
+        """
+        Persist the schedule atomically.
+        """
+        with self._lock:
+            data = {url: dict(state) for url, state in self._state.items()}
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=2, sort_keys=True)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.error(f"Error saving poll schedule to {self.path}: {str(e)}")
@@ -0,0 +1,296 @@
+import argparse
+import base64
+import json
+import logging
+import threading
+from datetime import date
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from article_query import SORT_COLUMNS, ArticleFilters, ArticleQuery
+from article_store import DEFAULT_STORE_PATH, ArticleStore
+from rollups import DIMENSIONS, GRANULARITIES, Rollups
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8080
+
+# Page size of /articles when no limit is given, and the largest allowed
+DEFAULT_LIMIT = 100
+MAX_LIMIT = 1000
+
+# Rows fetched from the store per query while streaming NDJSON
+STREAM_BATCH_SIZE = 500
+
+class BadRequest(ValueError):
+    """
+    Invalid query parameters; answered with 400.
+    """
+
+def _values(params: Dict[str, List[str]], name: str) -> Optional[List[str]]:
+    # Repeated parameters and comma-separated lists are both accepted
+    if name not in params:
+        return None
+    return [value for raw in params[name] for value in raw.split(',') if value]
+
+def _single(params: Dict[str, List[str]], name: str, default: str = '') -> str:
+    values = params.get(name)
+    return values[-1] if values else default
+
+def _date(params: Dict[str, List[str]], name: str) -> Optional[date]:
+    value = _single(params, name)
+    if not value:
+        return None
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        raise BadRequest(f"{name} must be a date (YYYY-MM-DD): {value!r}")
+
+def _int(params: Dict[str, List[str]], name: str, default: int, maximum: int) -> int:
+    value = _single(params, name)
+    if not value:
+        return default
+    try:
+        number = int(value)
+    except ValueError:
+        raise BadRequest(f"{name} must be an integer: {value!r}")
+    if not 1 <= number <= maximum:
+        raise BadRequest(f"{name} must be between 1 and {maximum}")
+    return number
+
+def parse_filters(params: Dict[str, List[str]]) -> ArticleFilters:
+    """
+    The dashboard's filters from query parameters: country, source and
+    language (repeated or comma-separated), start and end (inclusive
+    YYYY-MM-DD days) and q (full-text search).
+    """
+    return ArticleFilters(
+        countries=_values(params, 'country'),
+        sources=_values(params, 'source'),
+        languages=_values(params, 'language'),
+        start=_date(params, 'start'),
+        end=_date(params, 'end'),
+        search=_single(params, 'q')
+    )
+
+def parse_order(params: Dict[str, List[str]]) -> Tuple[str, bool]:
+    sort = _single(params, 'sort', 'relevance' if _single(params, 'q') else 'published_date')
+    if sort not in SORT_COLUMNS:
+        raise BadRequest(f"sort must be one of {', '.join(SORT_COLUMNS)}")
+    order = _single(params, 'order', 'desc')
+    if order not in ('asc', 'desc'):
+        raise BadRequest("order must be asc or desc")
+    return sort, order == 'desc'
+
+def encode_cursor(sort: str, descending: bool, key: Tuple[Any, int]) -> str:
+    payload = json.dumps([sort, descending, *key], separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(payload).decode('ascii').rstrip('=')
+
+def decode_cursor(cursor: str, sort: str, descending: bool) -> Tuple[Any, int]:
+    """
+    Key encoded in a cursor; it must come from a query with the same order.
+    """
+    try:
+        payload = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        cursor_sort, cursor_descending, value, row_id = json.loads(payload)
+    except (ValueError, TypeError):
+        raise BadRequest("invalid cursor")
+    # Only a sort value and a rowid may reach the query
+    if (isinstance(value, bool) or not isinstance(value, (str, int, float))
+            or isinstance(row_id, bool) or not isinstance(row_id, int)):
+        raise BadRequest("invalid cursor")
+    if (cursor_sort, cursor_descending) != (sort, descending):
+        raise BadRequest("cursor belongs to a different sort order")
+    return value, row_id
+
+class QueryAPI:
+    """
+    Read-only HTTP/JSON access to the article store.
+
+    Endpoints (all GET, filters as in ``parse_filters``):
+
+    - ``/articles``: one page of matching articles as JSON, in ``sort``
+      order (``published_date``, ``title``, ``source``, ``country``,
+      ``language`` or ``relevance``; ``order=asc|desc``) with ``limit`` rows
+      and a ``next_cursor`` to pass as ``cursor`` for the next page.
+      ``group_stories=1`` returns every story once.
+    - ``/articles.ndjson``: all matching articles (or ``limit``) streamed as
+      newline-delimited JSON, read from the store in batches.
+    - ``/counts``: article counts from the rollups, ``by`` country, source,
+      language or bucket (per ``granularity`` hour or day).
+    - ``/health``
+
+    Queries run on the store's indexes (see ``ArticleQuery``), never as a
+    scan in Python. Every handler thread has its own read-only connections;
+    ``serve`` brings the store's schema and indexes up to date once at
+    startup.
+    """
+
+    def __init__(self, store_path: str = DEFAULT_STORE_PATH):
+        self.store_path = store_path
+        self._local = threading.local()
+
+    def query(self) -> ArticleQuery:
+        if getattr(self._local, 'query', None) is None:
+            self._local.query = ArticleQuery(self.store_path, read_only=True)
+        return self._local.query
+
+    def rollups(self) -> Rollups:
+        if getattr(self._local, 'rollups', None) is None:
+            self._local.rollups = Rollups(self.store_path, read_only=True)
+        return self._local.rollups
+
+    def articles(self, params: Dict[str, List[str]]) -> Dict[str, Any]:
+        filters = parse_filters(params)
+        sort, descending = parse_order(params)
+        limit = _int(params, 'limit', DEFAULT_LIMIT, MAX_LIMIT)
+        cursor = _single(params, 'cursor')
+        after = decode_cursor(cursor, sort, descending) if cursor else None
+        rows, next_key = self.query().seek(
+            filters,
+            sort=sort,
+            descending=descending,
+            limit=limit,
+            after=after,
+            group_stories=_single(params, 'group_stories') in ('1', 'true')
+        )
+        return {
+            'articles': rows,
+            'next_cursor': encode_cursor(sort, descending, next_key) if next_key is not None else None
+        }
+
+    def stream(self, params: Dict[str, List[str]]):
+        """
+        Generator of NDJSON lines of all matching articles.
+        """
+        filters = parse_filters(params)
+        sort, descending = parse_order(params)
+        remaining = _int(params, 'limit', 0, 2 ** 31) if _single(params, 'limit') else None
+        group_stories = _single(params, 'group_stories') in ('1', 'true')
+        query = self.query()
+
+        def lines():
+            nonlocal remaining
+            after = None
+            while remaining is None or remaining > 0:
+                batch = STREAM_BATCH_SIZE if remaining is None else min(STREAM_BATCH_SIZE, remaining)
+                rows, after = query.seek(filters, sort, descending, batch, after, group_stories)
+                for row in rows:
+                    yield (json.dumps(row, ensure_ascii=False) + '\n').encode('utf-8')
+                if remaining is not None:
+                    remaining -= len(rows)
+                if after is None:
+                    break
+
+        return lines()
+
+    def counts(self, params: Dict[str, List[str]]) -> Dict[str, Any]:
+        filters = parse_filters(params)
+        by = _single(params, 'by', 'country')
+        granularity = _single(params, 'granularity', 'day')
+        if by not in DIMENSIONS + ('bucket',) or granularity not in GRANULARITIES:
+            raise BadRequest(f"by must be one of {', '.join(DIMENSIONS + ('bucket',))}, granularity hour or day")
+        counts = self.rollups().counts(
+            by,
+            countries=filters.countries,
+            sources=filters.sources,
+            languages=filters.languages,
+            start=filters.start,
+            end=filters.end,
+            granularity=granularity
+        )
+        return {
+            'by': by,
+            'counts': [
+                {by: key.isoformat() if by == 'bucket' else key, 'articles': count}
+                for key, count in counts
+            ]
+        }
+
+    def handler(self):
+        api = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def _send_json(self, status: int, body: Dict[str, Any]) -> None:
+                payload = json.dumps(body, ensure_ascii=False).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json; charset=utf-8')
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def _send_stream(self, lines) -> None:
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/x-ndjson; charset=utf-8')
+                self.send_header('Transfer-Encoding', 'chunked')
+                self.end_headers()
+                try:
+                    for line in lines:
+                        self.wfile.write(b'%x\r\n%s\r\n' % (len(line), line))
+                except (BrokenPipeError, ConnectionResetError):
+                    raise
+                except Exception as e:
+                    # The status is sent; closing without the last chunk
+                    # tells the client the stream is incomplete
+                    logger.error(f"Error streaming {self.path}: {str(e)}")
+                    self.close_connection = True
+                    return
+                self.wfile.write(b'0\r\n\r\n')
+
+            def do_GET(self) -> None:
+                parts = urlsplit(self.path)
+                params = parse_qs(parts.query)
+                try:
+                    if parts.path == '/articles':
+                        self._send_json(200, api.articles(params))
+                    elif parts.path == '/articles.ndjson':
+                        self._send_stream(api.stream(params))
+                    elif parts.path == '/counts':
+                        self._send_json(200, api.counts(params))
+                    elif parts.path == '/health':
+                        self._send_json(200, {'status': 'ok'})
+                    else:
+                        self._send_json(404, {'error': f"unknown path {parts.path}"})
+                except BadRequest as e:
+                    self._send_json(400, {'error': str(e)})
+                except (BrokenPipeError, ConnectionResetError):
+                    logger.info(f"Client went away during {self.path}")
+                except Exception as e:
+                    logger.error(f"Error serving {self.path}: {str(e)}")
+                    self._send_json(500, {'error': 'internal error'})
+
+            def log_message(self, format: str, *args) -> None:
+                logger.info(f"{self.address_string()} - {format % args}")
+
+        return Handler
+
+    def serve(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT) -> None:
+        # Creates the schema and catches up the indexes, once
+        ArticleStore(self.store_path).close()
+        server = ThreadingHTTPServer((host, port), self.handler())
+        server.daemon_threads = True
+        logger.info(f"Serving the article store {self.store_path} on http://{host}:{port}")
+        try:
+            server.serve_forever()
+        finally:
+            server.server_close()
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="HTTP/JSON query API over the article store")
+    parser.add_argument('--host', default=DEFAULT_HOST, help="Address to listen on")
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help="Port to listen on")
+    parser.add_argument('--store', default=DEFAULT_STORE_PATH, help="Path of the SQLite article store")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    try:
+        QueryAPI(args.store).serve(args.host, args.port)
+    except KeyboardInterrupt:
+        logger.info("Query API stopped.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+import threading
+import time
+from typing import Dict
+from urllib.parse import urlsplit
+
+
+def host_of(url: str) -> str:
+    """
+    Return the lower-cased host (including port) of a URL.
+    """
+    return urlsplit(url).netloc.lower()
+
+
+class HostRateLimiter:
+    """
+    Politeness delay applied per host rather than globally.
+
+    Each call to ``wait`` reserves the next free slot for the URL's host and
+    sleeps until that slot is reached, so concurrent workers hitting the same
+    host are spaced ``min_interval`` seconds apart while requests to other
+    hosts proceed immediately.
+    """
+
+    def __init__(self, min_interval: float = 1.0):
+        self.min_interval = min_interval
+        self._lock = threading.Lock()
+        self._next_slot: Dict[str, float] = {}
+
+    def wait(self, url: str) -> None:
+        """
+        Block until a request to the host of ``url`` is allowed.
+        """
+        host = host_of(url)
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + self.min_interval
+
+        delay = slot - now
+        if delay > 0:
+            time.sleep(delay)
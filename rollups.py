@@ -0,0 +1,173 @@
+import os
+import sqlite3
+from collections import Counter
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+from urllib.request import pathname2url
+
+from article import from_epoch, to_epoch
+
+# Article counts of the article store pre-aggregated per hour and per day
+# (UTC) and per country, source and language. They are updated in the
+# transaction that inserts the articles, so the dashboard's charts and date
+# bounds cost one row per bucket instead of one per article.
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS article_counts_hour (
+    bucket INTEGER NOT NULL,
+    country TEXT NOT NULL,
+    source TEXT NOT NULL,
+    language TEXT NOT NULL,
+    articles INTEGER NOT NULL,
+    PRIMARY KEY (bucket, country, source, language)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS article_counts_day (
+    bucket INTEGER NOT NULL,
+    country TEXT NOT NULL,
+    source TEXT NOT NULL,
+    language TEXT NOT NULL,
+    articles INTEGER NOT NULL,
+    PRIMARY KEY (bucket, country, source, language)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS rollup_state (
+    id INTEGER PRIMARY KEY CHECK (id = 0),
+    last_rowid INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO rollup_state (id, last_rowid) VALUES (0, 0);
+"""
+
+# Bucket width in seconds of each rollup table
+GRANULARITIES = {'hour': 60 * 60, 'day': 24 * 60 * 60}
+
+DIMENSIONS = ('country', 'source', 'language')
+
+def ensure_schema(conn: sqlite3.Connection) -> None:
+    conn.executescript(SCHEMA)
+
+def add_rows(conn: sqlite3.Connection, rows: Iterable[Tuple[int, int, str, str, str]]) -> None:
+    """
+    Count (rowid, published epoch, country, source, language) rows of the
+    articles table into the rollups. Must be called inside the transaction
+    that inserted them.
+    """
+    counts: Dict[str, Counter] = {granularity: Counter() for granularity in GRANULARITIES}
+    last_rowid = None
+    for rowid, published, country, source, language in rows:
+        for granularity, width in GRANULARITIES.items():
+            counts[granularity][(published - published % width, country, source, language)] += 1
+        last_rowid = rowid if last_rowid is None else max(last_rowid, rowid)
+    if last_rowid is None:
+        return
+    for granularity, counter in counts.items():
+        conn.executemany(
+            f'INSERT INTO article_counts_{granularity} (bucket, country, source, language, articles) '
+            'VALUES (?, ?, ?, ?, ?) '
+            'ON CONFLICT (bucket, country, source, language) DO UPDATE SET articles = articles + excluded.articles',
+            [(*key, count) for key, count in counter.items()]
+        )
+    conn.execute(
+        'UPDATE rollup_state SET last_rowid = MAX(last_rowid, ?) WHERE id = 0',
+        (last_rowid,)
+    )
+
+def catch_up(conn: sqlite3.Connection) -> int:
+    """
+    Count articles inserted before the rollups existed; returns how many.
+    """
+    last_rowid = conn.execute('SELECT last_rowid FROM rollup_state WHERE id = 0').fetchone()[0]
+    rows = conn.execute(
+        'SELECT rowid, published_date, country, source, language FROM articles WHERE rowid > ? ORDER BY rowid',
+        (last_rowid,)
+    ).fetchall()
+    if rows:
+        with conn:
+            add_rows(conn, (
+                (rowid, to_epoch(datetime.fromisoformat(published_date)), country, source, language)
+                for rowid, published_date, country, source, language in rows
+            ))
+    return len(rows)
+
+class Rollups:
+    """
+    Read access to the rollups of an article store.
+
+    Opening it brings the rollups up to date, unless ``read_only`` opens the
+    store read-only and relies on ``ArticleStore`` having done so.
+    """
+
+    def __init__(self, path: str, read_only: bool = False):
+        if read_only:
+            uri = f"file:{pathname2url(os.path.abspath(path))}?mode=ro"
+            self.conn = sqlite3.connect(uri, uri=True, check_same_thread=False)
+        else:
+            self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute('PRAGMA busy_timeout=5000')
+        if not read_only:
+            ensure_schema(self.conn)
+            catch_up(self.conn)
+
+    def date_bounds(self) -> Optional[Tuple[date, date]]:
+        """
+        First and last publication day (UTC) in the store.
+        """
+        first, last = self.conn.execute('SELECT MIN(bucket), MAX(bucket) FROM article_counts_day').fetchone()
+        if first is None:
+            return None
+        return from_epoch(first).date(), from_epoch(last).date()
+
+    def values(self, dimension: str) -> List[str]:
+        """
+        Distinct values of a dimension (country, source or language).
+        """
+        if dimension not in DIMENSIONS:
+            raise ValueError(f"Unknown dimension: {dimension}")
+        return [row[0] for row in self.conn.execute(
+            f'SELECT DISTINCT {dimension} FROM article_counts_day ORDER BY {dimension}'
+        )]
+
+    def counts(
+        self,
+        by: str,
+        countries: Optional[Sequence[str]] = None,
+        sources: Optional[Sequence[str]] = None,
+        languages: Optional[Sequence[str]] = None,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+        granularity: str = 'day'
+    ) -> List[Tuple[object, int]]:
+        """
+        Article counts grouped by a dimension or by ``'bucket'`` (start of the
+        hour or day, as a naive UTC datetime), filtered like the dashboard.
+
+        Args:
+            by: 'country', 'source', 'language' or 'bucket'
+            countries, sources, languages: Values to keep (None keeps all)
+            start, end: Inclusive range of publication days
+            granularity: 'hour' or 'day' buckets
+
+        Returns:
+            (key, count) pairs ordered by key
+        """
+        if by not in DIMENSIONS + ('bucket',) or granularity not in GRANULARITIES:
+            raise ValueError(f"Unknown grouping: {by} by {granularity}")
+        where, params = [], []
+        for column, selected in zip(DIMENSIONS, (countries, sources, languages)):
+            if selected is not None:
+                where.append(f"{column} IN ({','.join('?' * len(selected))})")
+                params.extend(selected)
+        if start is not None:
+            where.append('bucket >= ?')
+            params.append(to_epoch(datetime.combine(start, datetime.min.time())))
+        if end is not None:
+            where.append('bucket < ?')
+            params.append(to_epoch(datetime.combine(end + timedelta(days=1), datetime.min.time())))
+        sql = f'SELECT {by}, SUM(articles) FROM article_counts_{granularity}'
+        if where:
+            sql += ' WHERE ' + ' AND '.join(where)
+        sql += f' GROUP BY {by} ORDER BY {by}'
+        rows = self.conn.execute(sql, params).fetchall()
+        if by == 'bucket':
+            return [(from_epoch(bucket), count) for bucket, count in rows]
+        return rows
+
+    def close(self) -> None:
+        self.conn.close()
@@ -3,217 +3,253 @@ RSS_FEEDS = [
     {
         "url": "https://timesofindia.indiatimes.com/rssfeeds/-2128936835.cms",
         "agency": "Times of India",
-        "country": "India"
+        "country": "India",
+        "language": "en"
     },
     {
         "url": "https://www.thehindu.com/news/national/feeder/default.rss",
         "agency": "The Hindu",
-        "country": "India"
+        "country": "India",
+        "language": "en"
     },
     {
         "url": "https://indianexpress.com/section/india/feed/",
         "agency": "Indian Express",
-        "country": "India"
+        "country": "India",
+        "language": "en"
     },
     {
         "url": "https://www.ndtv.com/feeds/latest",
         "agency": "NDTV",
-        "country": "India"
+        "country": "India",
+        "language": "en"
     },
     {
         "url": "https://www.hindustantimes.com/feeds/rss",
         "agency": "Hindustan Times",
-        "country": "India"
+        "country": "India",
+        "language": "en"
     },
     
     # USA
     {
         "url": "http://rss.cnn.com/rss/edition.rss",
         "agency": "CNN",
-        "country": "USA"
+        "country": "USA",
+        "language": "en"
     },
     {
         "url": "https://feeds.npr.org/1001/rss.xml",
         "agency": "NPR",
-        "country": "USA"
+        "country": "USA",
+        "language": "en"
     },
     {
         "url": "https://www.nytimes.com/services/xml/rss/nyt/HomePage.xml",
         "agency": "New York Times",
-        "country": "USA"
+        "country": "USA",
+        "language": "en"
     },
     {
         "url": "https://www.washingtonpost.com/news-sitemap-index.xml",
         "agency": "Washington Post",
-        "country": "USA"
+        "country": "USA",
+        "language": "en"
     },
     {
         "url": "https://www.foxnews.com/about/rss/",
         "agency": "Fox News",
-        "country": "USA"
+        "country": "USA",
+        "language": "en"
     },
     
     # UK
     {
         "url": "http://feeds.bbci.co.uk/news/rss.xml",
         "agency": "BBC News",
-        "country": "UK"
+        "country": "UK",
+        "language": "en"
     },
     {
         "url": "https://www.theguardian.com/uk/rss",
         "agency": "The Guardian",
-        "country": "UK"
+        "country": "UK",
+        "language": "en"
     },
     {
         "url": "https://www.telegraph.co.uk/rss.xml",
         "agency": "The Telegraph",
-        "country": "UK"
+        "country": "UK",
+        "language": "en"
     },
     {
         "url": "https://www.independent.co.uk/rss",
         "agency": "The Independent",
-        "country": "UK"
+        "country": "UK",
+        "language": "en"
     },
     
     # Japan
     {
         "url": "https://www3.nhk.or.jp/rss/news/cat0.xml",
         "agency": "NHK",
-        "country": "Japan"
+        "country": "Japan",
+        "language": "ja"
     },
     
     # Germany
     {
         "url": "https://rss.dw.com/xml/rss-de-all",
         "agency": "Deutsche Welle",
-        "country": "Germany"
+        "country": "Germany",
+        "language": "de"
     },
     
     # France
     {
         "url": "https://www.lemonde.fr/rss/une.xml",
         "agency": "Le Monde",
-        "country": "France"
+        "country": "France",
+        "language": "fr"
     },
     {
         "url": "https://www.lefigaro.fr/rss/figaro_actualites.xml",
         "agency": "Le Figaro",
-        "country": "France"
+        "country": "France",
+        "language": "fr"
     },
     {
         "url": "https://www.liberation.fr/rss/",
         "agency": "Libération",
-        "country": "France"
+        "country": "France",
+        "language": "fr"
     },
     
     # Canada
     {
         "url": "https://www.cbc.ca/cmlink/rss-topstories",
         "agency": "CBC News",
-        "country": "Canada"
+        "country": "Canada",
+        "language": "en"
     },
     
     # Australia
     {
         "url": "https://www.abc.net.au/news/feed/51120/rss.xml",
         "agency": "ABC News",
-        "country": "Australia"
+        "country": "Australia",
+        "language": "en"
     },
     {
         "url": "https://www.smh.com.au/rss/feed.xml",
         "agency": "Sydney Morning Herald",
-        "country": "Australia"
+        "country": "Australia",
+        "language": "en"
     },
     {
         "url": "https://www.theaustralian.com.au/feed/",
         "agency": "The Australian",
-        "country": "Australia"
+        "country": "Australia",
+        "language": "en"
     },
     
     # Russia
     {
         "url": "https://tass.com/rss/v2.xml",
         "agency": "TASS",
-        "country": "Russia"
+        "country": "Russia",
+        "language": "en"
     },
     
     # South Korea
     {
         "url": "https://www.koreatimes.co.kr/www/rss/world.xml",
         "agency": "Korea Times",
-        "country": "South Korea"
+        "country": "South Korea",
+        "language": "en"
     },
     
     # Malaysia
     {
         "url": "https://www.thestar.com.my/rss/editors-choice",
         "agency": "The Star",
-        "country": "Malaysia"
+        "country": "Malaysia",
+        "language": "en"
     },
     
     # Singapore
     {
         "url": "https://www.straitstimes.com/news/world/rss.xml",
         "agency": "The Straits Times",
-        "country": "Singapore"
+        "country": "Singapore",
+        "language": "en"
     },
     
     # Indonesia
     {
         "url": "https://www.antaranews.com/rss/terkini",
         "agency": "Antara News",
-        "country": "Indonesia"
+        "country": "Indonesia",
+        "language": "id"
     },
     
     # Brazil
     {
         "url": "https://g1.globo.com/dynamo/rss2.xml",
         "agency": "G1",
-        "country": "Brazil"
+        "country": "Brazil",
+        "language": "pt"
     },
     
     # Mexico
     {
         "url": "https://www.mexiconewsdaily.com/feed/",
         "agency": "Mexico News Daily",
-        "country": "Mexico"
+        "country": "Mexico",
+        "language": "en"
     },
     
     # UAE
     {
         "url": "https://www.emirates247.com/rss",
         "agency": "Emirates 24/7",
-        "country": "UAE"
+        "country": "UAE",
+        "language": "en"
     },
     {
         "url": "https://gulfnews.com/rss",
         "agency": "Gulf News",
-        "country": "UAE"
+        "country": "UAE",
+        "language": "en"
     },
     {
         "url": "https://www.arabianbusiness.com/rss",
         "agency": "Arabian Business",
-        "country": "UAE"
+        "country": "UAE",
+        "language": "en"
     },
     
     # Italy
     {
         "url": "https://www.ansa.it/sito/ansait_rss.xml",
         "agency": "ANSA",
-        "country": "Italy"
+        "country": "Italy",
+        "language": "it"
     },
     
     # South Africa
     {
         "url": "https://www.businesslive.co.za/rss",
         "agency": "Business Live",
-        "country": "South Africa"
+        "country": "South Africa",
+        "language": "en"
     },
     
     # New Zealand
     {
         "url": "https://www.stuff.co.nz/rss",
         "agency": "Stuff",
-        "country": "New Zealand"
+        "country": "New Zealand",
+        "language": "en"
     }
 ] 
\ No newline at end of file
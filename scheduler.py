@@ -1,8 +1,27 @@
-import schedule
+import os
+# Ensure directories exist before logging is configured
+os.makedirs('data', exist_ok=True)
+os.makedirs('logs', exist_ok=True)
+
+import argparse
 import time
 import logging
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from datetime import datetime
-from main import main as run_scraper
+from typing import Dict, List
+
+from article_store import ArticleStore, DEFAULT_STORE_PATH
+from dedup_index import DedupIndex
+from feed_health import FeedHealthStore
+from feed_state import FeedStateStore
+from http_session import FeedSession
+from metrics import DEFAULT_METRICS_PATHS, RunMetrics, activate
+from parse_pool import ParsePool
+from poll_schedule import DEFAULT_SCHEDULE_PATH, PollSchedule
+from rate_limit import HostRateLimiter
+from rss_links import RSS_FEEDS
+from scraper import DEFAULT_MAX_WORKERS, RSSScraper
+from sinks import StoreSink
 
 # Configure logging
 logging.basicConfig(
@@ -16,33 +35,161 @@ logging.basicConfig(
 
 logger = logging.getLogger(__name__)
 
-def job():
+# Longest time the loop sleeps before re-checking the schedule
+MAX_SLEEP = 60
+
+# Buffered dataset rows (Parquet) are written out at least this often, so a
+# poll does not leave one tiny part file per feed and partition
+FLUSH_INTERVAL = 15 * 60
+
+class FeedScheduler:
     """
-    Job function to run the scraper.
+    In-process polling loop over all feeds.
+
+    Each feed is polled on its own adaptive schedule (see ``PollSchedule``)
+    instead of all feeds every few hours: only feeds that are due are handed
+    to a long-lived worker pool, and the session, dedup index, article store
+    and export sink stay open between polls. Feeds whose circuit breaker is
+    open (see ``FeedHealthStore``) are postponed until their next probe.
     """
-    try:
-        logger.info("Starting scheduled scraping job...")
-        run_scraper()
-        logger.info("Scheduled scraping job completed successfully!")
-    except Exception as e:
-        logger.error(f"Error in scheduled job: {str(e)}")
 
-def main():
+    def __init__(
+        self,
+        feeds: List[Dict[str, str]],
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        output_format: str = 'csv',
+        store_path: str = DEFAULT_STORE_PATH,
+        schedule_path: str = DEFAULT_SCHEDULE_PATH,
+        parse_workers: int = 0
+    ):
+        self.feeds = {feed_info['url']: feed_info for feed_info in feeds}
+        self.max_workers = max(1, max_workers)
+        self.output_format = output_format
+        self.store_path = store_path
+        self.parse_workers = parse_workers
+        self.schedule = PollSchedule(schedule_path)
+        self.state_store = FeedStateStore()
+        self.rate_limiter = HostRateLimiter()
+        self.metrics = RunMetrics()
+        self.health = FeedHealthStore()
+
+    def run(self) -> None:
+        """
+        Poll due feeds until interrupted.
+        """
+        in_flight: Dict[Future, str] = {}
+        last_flush = time.time()
+        parse_pool = ParsePool(self.parse_workers) if self.parse_workers > 0 else None
+        with FeedSession() as session, \
+                DedupIndex() as dedup_index, \
+                ArticleStore(self.store_path) as store, \
+                ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            sink = StoreSink(store, output_format=self.output_format, dedup_index=dedup_index)
+
+            def poll(feed_info: Dict[str, str]) -> int:
+                feed_metrics = self.metrics.feed(feed_info)
+                scraper = RSSScraper(
+                    feed_info,
+                    self.rate_limiter,
+                    self.state_store,
+                    session,
+                    dedup_index=dedup_index,
+                    poll_schedule=self.schedule,
+                    metrics=feed_metrics,
+                    parse_pool=parse_pool
+                )
+                started = time.perf_counter()
+                try:
+                    with activate(feed_metrics):
+                        new_items = sink.write(feed_info, scraper.iter_entries())
+                    scraper.save_validators()
+                    return new_items
+                except Exception as e:
+                    feed_metrics.error = str(e)
+                    raise
+                finally:
+                    feed_metrics.total_seconds = time.perf_counter() - started
+                    self.health.record(feed_metrics)
+
+            try:
+                while True:
+                    idle = [url for url in self.feeds if url not in in_flight.values()]
+                    for url in self.schedule.due(idle):
+                        if not self.health.allow(url):
+                            self.schedule.postpone(url, self.health.retry_at(url))
+                            continue
+                        in_flight[executor.submit(poll, self.feeds[url])] = url
+
+                    idle = [url for url in self.feeds if url not in in_flight.values()]
+                    next_due = min((self.schedule.next_due(url) for url in idle), default=None)
+                    timeout = MAX_SLEEP if next_due is None else min(MAX_SLEEP, max(0.0, next_due - time.time()))
+                    if not in_flight:
+                        time.sleep(timeout)
+                        continue
+
+                    done, _ = wait(in_flight, timeout=timeout, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        url = in_flight.pop(future)
+                        try:
+                            new_items = future.result()
+                        except Exception as e:
+                            logger.error(f"Unexpected error polling {url}: {str(e)}")
+                            new_items = 0
+                        due_at = self.schedule.record(url, new_items)
+                        logger.info(
+                            f"Polled {url}: {new_items} new, next poll at "
+                            f"{datetime.fromtimestamp(due_at).strftime('%H:%M:%S')}"
+                        )
+
+                    if done:
+                        if time.time() - last_flush >= FLUSH_INTERVAL:
+                            sink.flush()
+                            last_flush = time.time()
+                        self.state_store.save()
+                        self.schedule.save()
+                        self.health.save()
+                        for path in DEFAULT_METRICS_PATHS:
+                            self.metrics.write(path)
+                        # Committing forgets the claims of feeds still in flight
+                        if not in_flight:
+                            dedup_index.commit()
+            finally:
+                for future in in_flight:
+                    future.cancel()
+                executor.shutdown(wait=True)
+                if parse_pool is not None:
+                    parse_pool.close()
+                sink.close()
+                dedup_index.commit()
+                self.state_store.save()
+                self.schedule.save()
+                self.health.save()
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Poll RSS feeds continuously on adaptive schedules")
+    parser.add_argument('--workers', type=int, default=DEFAULT_MAX_WORKERS,
+                        help="Feeds fetched at the same time")
+    parser.add_argument('--format', choices=['csv', 'json', 'parquet'], default='csv',
+                        help="Export format of the collected articles")
+    parser.add_argument('--parse-workers', type=int, default=0,
+                        help="Processes parsing and normalising feed documents (0: parse in the fetch threads)")
+    return parser.parse_args(argv)
+
+def main(argv=None):
     """
     Main function to set up and run the scheduler.
     """
-    # Schedule the job to run every 6 hours
-    schedule.every(6).hours.do(job)
-    
-    # Run the job immediately on startup
-    job()
-    
-    logger.info("Scheduler started. Running every 6 hours.")
-    
-    # Keep the script running
-    while True:
-        schedule.run_pending()
-        time.sleep(60)
+    args = parse_args(argv)
+    logger.info(f"Scheduler started for {len(RSS_FEEDS)} feeds with adaptive per-feed intervals.")
+    try:
+        FeedScheduler(
+            RSS_FEEDS,
+            max_workers=args.workers,
+            output_format=args.format,
+            parse_workers=args.parse_workers
+        ).run()
+    except KeyboardInterrupt:
+        logger.info("Scheduler stopped.")
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    main()
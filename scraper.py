@@ -1,236 +1,576 @@
-import feedparser
 import requests
-from typing import Dict, Any, List
+from typing import Dict, Any, Callable, Iterable, Iterator, List, Mapping, Optional, Tuple
 import logging
-from datetime import datetime, timedelta
 import time
-from tqdm import tqdm
-from langdetect import detect, LangDetectException
-import pandas as pd
-from bs4 import BeautifulSoup
-import re
+from collections import Counter
+from contextlib import nullcontext
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
 
+from article import Article, to_epoch
+from article_store import ArticleStore, DEFAULT_STORE_PATH
+from date_parsing import DateParser, default_parser
+from dedup_index import DedupIndex
+from feed_health import FeedHealthStore
+from feed_state import FeedStateStore
+from http_session import FeedSession
+from language_detection import LanguageDetector, default_detector
+from metrics import DEFAULT_METRICS_PATHS, FeedMetrics, RunMetrics, activate
+from parse_pool import ParsePool
+from poll_schedule import PollSchedule, feed_interval_hint, parse_retry_after
+from rate_limit import HostRateLimiter
+from sinks import StoreSink
 from utils import (
     clean_text,
-    parse_date,
-    is_within_timeframe,
-    deduplicate_entries,
-    save_to_csv,
-    save_to_json
+    iter_unique_entries,
+    timeframe_cutoff
 )
 
 logger = logging.getLogger(__name__)
 
+# Default number of feeds fetched in parallel
+DEFAULT_MAX_WORKERS = 8
+
+# Entries whose language is detected together
+LANGUAGE_BATCH_SIZE = 64
+
+def entry_description(entry: Dict[str, Any]) -> str:
+    """Raw description of a feed entry, trying the possible fields in turn"""
+    if 'description' in entry:
+        return entry['description']
+    if 'summary' in entry:
+        return entry['summary']
+    if 'content' in entry:
+        return entry['content'][0]['value']
+    return ''
+
 class RSSScraper:
-    def __init__(self, feed_info: Dict[str, str]):
+    def __init__(
+        self,
+        feed_info: Dict[str, str],
+        rate_limiter: Optional[HostRateLimiter] = None,
+        state_store: Optional[FeedStateStore] = None,
+        session: Optional[FeedSession] = None,
+        date_parser: Optional[DateParser] = None,
+        language_detector: Optional[LanguageDetector] = None,
+        dedup_index: Optional[DedupIndex] = None,
+        poll_schedule: Optional[PollSchedule] = None,
+        metrics: Optional[FeedMetrics] = None,
+        parse_pool: Optional[ParsePool] = None
+    ):
         self.url = feed_info['url']
         self.agency = feed_info['agency']
         self.country = feed_info['country']
-        self.headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
+        self.language = feed_info.get('language')
+        self.rate_limiter = rate_limiter or HostRateLimiter()
+        self.state_store = state_store
+        # Built on first fetch, so scrapers that only process documents
+        # (e.g. in the parse pool's workers) never open one
+        self._session = session
+        self.date_parser = date_parser or default_parser
+        self.language_detector = language_detector or default_detector
+        self.dedup_index = dedup_index
+        self.poll_schedule = poll_schedule
+        self.metrics = metrics
+        self.parse_pool = parse_pool
+        # Validators of the fetched document, saved once its entries are stored
+        self.validators: Optional[Mapping[str, str]] = None
+
+    @property
+    def session(self) -> FeedSession:
+        if self._session is None:
+            self._session = FeedSession()
+        return self._session
+
+    def _timer(self, stage: str):
+        return self.metrics.timer(stage) if self.metrics is not None else nullcontext()
 
     def detect_language(self, text: str) -> str:
         """
         Detect the language of the given text.
 
         """
-        try:
-            return detect(text)
-        except LangDetectException:
-            return 'unknown'
+        return self.language_detector.detect_batch([text], self.url, self.language)[0]
 
-    def fetch_feed(self) -> List[Dict[str, Any]]:
+    def fetch_feed(self) -> List[Article]:
         """
         Fetch and parse RSS feed.
         
         Returns:
-            List of dictionaries containing parsed feed entries
+            List of article records parsed from the feed
+        """
+        return list(self.iter_entries())
+
+    def iter_entries(self) -> Iterator[Article]:
+        """
+        Stream the feed's entries through the processing stages.
+        
+        Errors are logged and end the stream; the document's validators are
+        then discarded so the next run fetches it again.
+        
+        Yields:
+            Article records parsed from the feed
         """
         try:
-            # Add delay to respect rate limits
-            time.sleep(1)
-            
-            # Fetch feed with custom headers
-            response = requests.get(self.url, headers=self.headers, timeout=30)
-            response.raise_for_status()
-            
-            # Parse feed
-            feed = feedparser.parse(response.content)
-            
-            if feed.bozo:
-                logger.warning(f"Feed parsing issues for {self.url}: {feed.bozo_exception}")
-            
-            entries = []
-            for entry in feed.entries:
-                try:
-                    # Extract and clean data
-                    title = clean_text(entry.get('title', ''))
-                    
-                    # Try different possible fields for description/summary
-                    description = ''
-                    if 'description' in entry:
-                        description = clean_text(entry['description'])
-                    elif 'summary' in entry:
-                        description = clean_text(entry['summary'])
-                    elif 'content' in entry:
-                        description = clean_text(entry['content'][0]['value'])
-                    
-                    # Get the article URL
-                    link = entry.get('link', '')
-                    
-                    # Parse publication date
-                    published = parse_date(entry.get('published', ''))
-                    if published.tzinfo is not None:
-                        published = published.replace(tzinfo=None)
-                    
-                    # Only include entries within the last year
-                    if not is_within_timeframe(published):
-                        continue
-                    
-                    # Detect language from title and description
-                    combined_text = f"{title} {description}"
-                    language = self.detect_language(combined_text)
-                    
-                    entries.append({
-                        'title': title,
-                        'description': description,
-                        'url': link,
-                        'published_date': published.isoformat(),
-                        'source': self.agency,
-                        'country': self.country,
-                        'language': language
-                    })
-                except Exception as e:
-                    logger.error(f"Error processing entry from {self.url}: {str(e)}")
-                    continue
-            
-            return deduplicate_entries(entries)
+            content = self.fetch_payload()
+            if content is None:
+                return
+            yield from self.process_payload(content)
             
         except requests.RequestException as e:
             logger.error(f"Error fetching feed {self.url}: {str(e)}")
-            return []
+            self.validators = None
+            if self.metrics is not None:
+                self.metrics.error = str(e)
         except Exception as e:
             logger.error(f"Unexpected error processing {self.url}: {str(e)}")
-            return []
+            self.validators = None
+            if self.metrics is not None:
+                self.metrics.error = str(e)
 
-    def fetch_historical_feed(self, start_date: datetime, end_date: datetime) -> List[Dict[str, Any]]:
-        """Fetch historical feed data between start_date and end_date"""
-        all_entries = []
-        current_date = start_date
+    def fetch_payload(self, url: Optional[str] = None) -> Optional[bytes]:
+        """
+        Fetch the raw feed document.
         
-        while current_date <= end_date:
-            try:
-                # Add date parameter to feed URL if supported
-                date_str = current_date.strftime('%Y-%m-%d')
-                feed_url = f"{self.url}?date={date_str}"
-                
-                # Fetch feed with rate limiting
-                time.sleep(2)  # Rate limiting
-                feed = feedparser.parse(feed_url, request_headers=self.headers)
-                
-                if feed.entries:
-                    for entry in feed.entries:
-                        entry_date = self._parse_date(entry.get('published', ''))
-                        if start_date <= entry_date <= end_date:
-                            all_entries.append(self._process_entry(entry))
-                
-                current_date += timedelta(days=1)
+        Requests for the feed's own URL are conditional on the validators of
+        the previous response. The new validators are kept in
+        ``validators`` until ``save_validators`` is called, after the
+        document's entries have been stored.
+        
+        Args:
+            url: URL to fetch instead of the feed URL (e.g. a dated variant)
+            
+        Returns:
+            Response body, or None if the feed has not changed
+        """
+        url = url or self.url
+        conditional = self.state_store is not None and url == self.url
+        
+        # Respect rate limits of the feed's host
+        with self._timer('wait'):
+            self.rate_limiter.wait(url)
+        
+        # Fetch feed over the shared session, conditional on the last response
+        headers = self.state_store.conditional_headers(url) if conditional else {}
+        response = self.session.get(url, headers=headers, feed_metrics=self.metrics)
+        
+        # Nothing changed since the last fetch, skip parsing entirely
+        if response.status_code == 304:
+            logger.info(f"Feed not modified: {url}")
+            return None
+        
+        # Tell the scheduler when the server asks us to back off
+        if response.status_code in (429, 503) and self.poll_schedule is not None and url == self.url:
+            retry_after = parse_retry_after(response.headers.get('Retry-After'))
+            if retry_after is not None:
+                self.poll_schedule.observe_retry_after(url, retry_after)
+        response.raise_for_status()
+        
+        if conditional:
+            self.validators = response.headers
+        
+        return response.content
+
+    def save_validators(self) -> None:
+        """
+        Record the validators of the fetched document in the state store.
+        Call once its entries have been stored, so a document whose
+        processing or storing failed is fetched in full again.
+        """
+        if self.state_store is not None and self.validators is not None:
+            self.state_store.update(self.url, self.validators)
+        self.validators = None
+
+    def process_payload(
+        self,
+        content: bytes,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None
+    ) -> Iterator[Article]:
+        """
+        Parse a feed document and stream its entries through the stages.
+        
+        Stages are chained generators ordered cheapest first, so entries flow
+        through one at a time and the expensive ones (cleaning, language
+        detection) only see survivors: filter by date, drop already collected
+        articles, clean, tag language and drop duplicates within the feed.
+        How many entries each stage dropped is logged once per document.
+        
+        Args:
+            content: Raw feed document
+            start_date: Oldest publication date kept (default: one year ago)
+            end_date: Newest publication date kept (default: no limit)
+        """
+        if start_date is None and end_date is None:
+            # Only include entries within the last year
+            start_date = timeframe_cutoff()
+        
+        drops: Counter = Counter()
+        if self.parse_pool is not None:
+            received, entries = self._process_in_pool(content, start_date, end_date, drops)
+        else:
+            # Only documents that changed are parsed, so 304-only runs never
+            # load feedparser
+            import feedparser
+
+            with self._timer('parse'):
+                feed = feedparser.parse(content)
+            received = len(feed.entries)
+            self._observe_document(feed.bozo_exception if feed.bozo else None, feed_interval_hint(feed.feed))
+            
+            entries = self._filter_by_date(feed.entries, start_date, end_date, drops)
+            entries = self._drop_seen(entries, drops)
+            entries = self._clean(entries, drops)
+            entries = self._tag_language(entries)
+        
+        emitted = 0
+        try:
+            for entry in iter_unique_entries(entries, drops):
+                emitted += 1
+                yield entry
+        finally:
+            self._report_drops(received, emitted, drops)
+
+    def _observe_document(self, bozo_exception: Optional[Any], interval_hint: Optional[float]) -> None:
+        if bozo_exception is not None:
+            logger.warning(f"Feed parsing issues for {self.url}: {bozo_exception}")
+            if self.metrics is not None:
+                self.metrics.bozo = True
+        
+        if self.poll_schedule is not None:
+            self.poll_schedule.observe_interval_hint(self.url, interval_hint)
+
+    def _process_in_pool(
+        self,
+        content: bytes,
+        start_date: Optional[datetime],
+        end_date: Optional[datetime],
+        drops: Counter
+    ) -> Tuple[int, List[Article]]:
+        """
+        Parse and normalise a document in the parse pool's worker processes.
+        
+        The dedup check stays in this process, between the two pool calls,
+        so only articles not collected before are cleaned and tagged.
+        """
+        feed_info = {'url': self.url, 'agency': self.agency, 'country': self.country, 'language': self.language}
+        document = self.parse_pool.parse(feed_info, content, start_date, end_date)
+        self._merge_worker_stats(document.drops, document.seconds, drops)
+        self._observe_document(document.bozo_exception, document.interval_hint)
+        
+        candidates = (
+            ({'link': link, 'title': title, 'description': description}, published)
+            for link, title, description, published in document.items
+        )
+        new_items = [
+            (entry['link'], entry['title'], entry['description'], published)
+            for entry, published in self._drop_seen(candidates, drops)
+        ]
+        if not new_items:
+            return document.received, []
+        
+        batch = self.parse_pool.normalize(feed_info, new_items)
+        self._merge_worker_stats(batch.drops, batch.seconds, drops)
+        return document.received, batch.articles
+
+    def _merge_worker_stats(self, worker_drops: Counter, seconds: Dict[str, float], drops: Counter) -> None:
+        drops.update(worker_drops)
+        if self.metrics is not None:
+            for stage, value in seconds.items():
+                self.metrics.add_time(stage, value)
+
+    def _report_drops(self, received: int, emitted: int, drops: Counter) -> None:
+        if self.metrics is not None:
+            self.metrics.entries_in += received
+            self.metrics.entries_out += emitted
+            self.metrics.dropped.update(drops)
+        if drops:
+            summary = ', '.join(f"{count} {reason.replace('_', ' ')}" for reason, count in drops.most_common())
+            logger.info(f"Kept {emitted} of {received} entries from {self.url} (dropped: {summary})")
+
+    def historical_url(self, date_str: str) -> str:
+        """
+        Feed URL with a date parameter, for feeds that support one.
+        """
+        separator = '&' if '?' in self.url else '?'
+        return f"{self.url}{separator}date={date_str}"
+
+    def _filter_by_date(
+        self,
+        entries: Iterable[Dict[str, Any]],
+        start_date: Optional[datetime],
+        end_date: Optional[datetime],
+        drops: Counter
+    ) -> Iterator[Tuple[Dict[str, Any], datetime]]:
+        """Yield (entry, published) for entries with a date inside the timeframe"""
+        # feedparser's UTC structs compare as tuples, so entries outside the
+        # timeframe are dropped before any date is built or parsed
+        start_key = start_date.timetuple()[:6] if start_date is not None else None
+        end_key = end_date.timetuple()[:6] if end_date is not None else None
+        
+        for entry in entries:
+            with self._timer('date'):
+                parsed = entry.get('published_parsed') or entry.get('updated_parsed')
+                if parsed:
+                    key = tuple(parsed[:6])
+                    if (start_key is not None and key < start_key) or (end_key is not None and key > end_key):
+                        drops['outside_timeframe'] += 1
+                        continue
                 
+                # Parse publication date, skipping entries without a usable one
+                published = self.date_parser.parse_entry(entry, self.url)
+            if published is None:
+                drops['unparseable_date'] += 1
+                continue
+            if (start_date is not None and published < start_date) or (end_date is not None and published > end_date):
+                drops['outside_timeframe'] += 1
+                continue
+            yield entry, published
+
+    def _drop_seen(
+        self,
+        items: Iterable[Tuple[Dict[str, Any], datetime]],
+        drops: Counter
+    ) -> Iterator[Tuple[Dict[str, Any], datetime]]:
+        """Drop articles collected before, prior to any cleaning"""
+        if self.dedup_index is None:
+            yield from items
+            return
+        
+        for entry, published in items:
+            with self._timer('dedup'):
+                is_new = self.dedup_index.claim(entry.get('link', ''), entry.get('title', ''), self.agency, published)
+            if is_new:
+                yield entry, published
+            else:
+                drops['already_collected'] += 1
+
+    def _clean(
+        self,
+        items: Iterable[Tuple[Dict[str, Any], datetime]],
+        drops: Counter
+    ) -> Iterator[Article]:
+        """Extract and clean the fields of each entry"""
+        for entry, published in items:
+            try:
+                with self._timer('clean'):
+                    processed = self._process_entry(entry, published)
             except Exception as e:
-                logging.error(f"Error fetching historical feed for {date_str}: {str(e)}")
+                logger.error(f"Error processing entry from {self.url}: {str(e)}")
+                drops['processing_error'] += 1
                 continue
-                
-        return all_entries
+            yield processed
+
+    def _tag_language(
+        self,
+        entries: Iterable[Article],
+        batch_size: int = LANGUAGE_BATCH_SIZE
+    ) -> Iterator[Article]:
+        """Detect language from title and description, in small batches"""
+        batch = []
+        for entry in entries:
+            batch.append(entry)
+            if len(batch) >= batch_size:
+                yield from self._tag_batch(batch)
+                batch = []
+        if batch:
+            yield from self._tag_batch(batch)
+
+    def _tag_batch(self, batch: List[Article]) -> List[Article]:
+        with self._timer('language'):
+            languages = self.language_detector.detect_batch(
+                [f"{entry.title} {entry.description}" for entry in batch],
+                feed=self.url,
+                declared=self.language
+            )
+        for entry, language in zip(batch, languages):
+            entry.language = language
+        return batch
+
+    def _process_entry(self, entry: Dict[str, Any], published: datetime) -> Article:
+        """Process a single feed entry into an article record (language tagged later)"""
+        return Article(
+            clean_text(entry.get('title', '')),
+            clean_text(entry_description(entry)),
+            entry.get('link', ''),
+            to_epoch(published),
+            self.agency,
+            self.country
+        )
+
+def fetch_all_feeds(
+    feeds: List[Dict[str, str]],
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    rate_limiter: Optional[HostRateLimiter] = None,
+    state_store: Optional[FeedStateStore] = None,
+    session: Optional[FeedSession] = None,
+    dedup_index: Optional[DedupIndex] = None,
+    consume: Optional[Callable[[Dict[str, str], Iterator[Article]], Any]] = None,
+    metrics: Optional[RunMetrics] = None,
+    health: Optional[FeedHealthStore] = None,
+    parse_pool: Optional[ParsePool] = None
+) -> List[Tuple[Dict[str, str], Any]]:
+    """
+    Fetch all feeds concurrently with a bounded thread pool.
+    
+    Args:
+        feeds: List of feed information dictionaries
+        max_workers: Maximum number of feeds fetched at the same time
+        rate_limiter: Shared per-host rate limiter (created if omitted)
+        state_store: Store of ETag/Last-Modified validators used for
+            conditional requests (disabled if omitted); a feed's new
+            validators are recorded only once ``consume`` has returned
+        session: Pooled HTTP session shared by all fetches (created and
+            closed here if omitted)
+        dedup_index: Index of collected articles; entries already in it are
+            dropped before processing (disabled if omitted)
+        consume: Called in the worker thread with each feed's info and its
+            stream of entries; its return value becomes the feed's result.
+            Defaults to collecting the article records into a list.
+        metrics: Run metrics receiving per-feed, per-stage timings and
+            counters (disabled if omitted)
+        health: Feed health store; feeds whose circuit is open are skipped
+            (their result stays an empty list) and every fetch is recorded
+        parse_pool: Process pool that parses and normalises the documents
+            (parsed in the fetching threads if omitted)
+        
+    Returns:
+        List of (feed_info, result) pairs in the same order as ``feeds``
+    """
+    rate_limiter = rate_limiter or HostRateLimiter()
+    owns_session = session is None
+    session = session or FeedSession()
+    consume = consume or (lambda feed_info, entries: list(entries))
+    results: List[Any] = [[] for _ in feeds]
+    if health is not None and metrics is None:
+        metrics = RunMetrics()
     
-    def _parse_date(self, date_str: str) -> datetime:
-        """Parse date string to datetime object"""
+    def process(feed_info: Dict[str, str]) -> Any:
+        feed_metrics = metrics.feed(feed_info) if metrics is not None else None
+        scraper = RSSScraper(
+            feed_info,
+            rate_limiter,
+            state_store,
+            session,
+            dedup_index=dedup_index,
+            metrics=feed_metrics,
+            parse_pool=parse_pool
+        )
+        if feed_metrics is None:
+            result = consume(feed_info, scraper.iter_entries())
+            scraper.save_validators()
+            return result
+        
+        # Active for the consumer too, so sinks can report their time
+        started = time.perf_counter()
         try:
-            return pd.to_datetime(date_str).to_pydatetime()
-        except:
-            return datetime.now()
+            with activate(feed_metrics):
+                result = consume(feed_info, scraper.iter_entries())
+            scraper.save_validators()
+            return result
+        except Exception as e:
+            feed_metrics.error = str(e)
+            raise
+        finally:
+            feed_metrics.total_seconds = time.perf_counter() - started
+            if health is not None:
+                health.record(feed_metrics)
+    
+    allowed = [
+        (index, feed_info) for index, feed_info in enumerate(feeds)
+        if health is None or health.allow(feed_info['url'])
+    ]
+    if len(allowed) < len(feeds):
+        logger.info(f"Skipping {len(feeds) - len(allowed)} feeds with an open circuit")
     
-    def _process_entry(self, entry: Dict[str, Any]) -> Dict[str, Any]:
-        """Process a single feed entry"""
-        # Try different possible fields for description/summary
-        description = ''
-        if 'description' in entry:
-            description = self._clean_text(entry['description'])
-        elif 'summary' in entry:
-            description = self._clean_text(entry['summary'])
-        elif 'content' in entry:
-            description = self._clean_text(entry['content'][0]['value'])
-        
-        return {
-            'title': self._clean_text(entry.get('title', '')),
-            'description': description,
-            'url': entry.get('link', ''),
-            'published_date': self._parse_date(entry.get('published', '')).isoformat(),
-            'source': self.agency,
-            'country': self.country
+    from tqdm import tqdm
+
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        futures = {
+            executor.submit(process, feed_info): index
+            for index, feed_info in allowed
         }
+        for future in tqdm(as_completed(futures), total=len(futures), desc="Scraping feeds"):
+            index = futures[future]
+            try:
+                results[index] = future.result()
+            except Exception as e:
+                logger.error(f"Unexpected error fetching {feeds[index]['url']}: {str(e)}")
     
-    def _clean_text(self, text: str) -> str:
-        """Clean HTML and special characters from text"""
-        if not text:
-            return ''
-        # Remove HTML tags
-        soup = BeautifulSoup(text, 'html.parser')
-        text = soup.get_text()
-        # Remove special characters
-        text = re.sub(r'[^\w\s.,!?-]', '', text)
-        return text.strip()
-
-def scrape_all_feeds(feeds: List[Dict[str, str]], historical: bool = False) -> pd.DataFrame:
-    """Scrape all feeds and return as DataFrame"""
-    all_entries = []
+    if owns_session:
+        session.close()
+    if state_store is not None:
+        state_store.save()
+    if health is not None:
+        health.save()
     
-    for feed_info in feeds:
-        scraper = RSSScraper(feed_info)
-        
-        if historical:
-            # Fetch last year's data
-            end_date = datetime.now()
-            start_date = end_date - timedelta(days=365)
-            entries = scraper.fetch_historical_feed(start_date, end_date)
-        else:
-            # Fetch current feed
-            entries = scraper.fetch_feed()
-            
-        all_entries.extend(entries)
-        
-    return pd.DataFrame(all_entries)
+    return list(zip(feeds, results))
 
-def scrape_all_feeds(feeds: List[Dict[str, str]], output_format: str = 'csv') -> None:
+def scrape_all_feeds(
+    feeds: List[Dict[str, str]],
+    output_format: str = 'csv',
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    store_path: str = DEFAULT_STORE_PATH,
+    export: bool = True,
+    metrics_paths: Iterable[str] = DEFAULT_METRICS_PATHS,
+    parse_workers: int = 0,
+    rate_limiter: Optional[HostRateLimiter] = None
+) -> None:
     """
     Scrape all provided RSS feeds and save the results.
     
+    Each feed's entries are streamed into the article store as they are
+    processed; the per-feed and combined files of the day are append-only
+    exports of the new articles ('parquet' writes a dataset partitioned by
+    publication day and country instead). Memory use is bounded by the feeds in
+    flight rather than by the whole run.
+    
     Args:
         feeds: List of feed information dictionaries
-        output_format: Output format ('csv' or 'json')
+        output_format: Output format ('csv', 'json' or 'parquet')
+        max_workers: Maximum number of feeds fetched at the same time
+        store_path: Path of the SQLite article store
+        export: Whether to append new articles to the daily export files
+        metrics_paths: Files the run's per-feed metrics are written to
+            (``.prom`` for Prometheus text format, JSON summary otherwise)
+        parse_workers: Number of processes parsing and normalising feed
+            documents; 0 parses in the fetching threads
+        rate_limiter: Shared per-host rate limiter (default: one request per
+            second and host)
     """
-    all_entries = []
+    state_store = FeedStateStore()
+    metrics = RunMetrics()
+    health = FeedHealthStore()
+    parse_pool = ParsePool(parse_workers) if parse_workers > 0 else None
     
-    # Create progress bar
-    for feed_info in tqdm(feeds, desc="Scraping feeds"):
-        scraper = RSSScraper(feed_info)
-        entries = scraper.fetch_feed()
-        all_entries.extend(entries)
-        
-        # Save individual feed data
-        if entries:
-            filename = f"data/{feed_info['country']}_{feed_info['agency']}_{datetime.now().strftime('%Y%m%d')}.{output_format}"
-            if output_format == 'csv':
-                save_to_csv(entries, filename)
-            else:
-                save_to_json(entries, filename)
-    
-    # Save combined data
-    if all_entries:
-        combined_filename = f"data/all_news_{datetime.now().strftime('%Y%m%d')}.{output_format}"
-        if output_format == 'csv':
-            save_to_csv(all_entries, combined_filename)
-        else:
-            save_to_json(all_entries, combined_filename)
+    with FeedSession() as session, DedupIndex() as dedup_index, ArticleStore(store_path) as store:
+        sink = StoreSink(store, output_format=output_format, export=export, dedup_index=dedup_index)
+        try:
+            fetch_all_feeds(
+                feeds,
+                max_workers=max_workers,
+                rate_limiter=rate_limiter,
+                state_store=state_store,
+                session=session,
+                dedup_index=dedup_index,
+                consume=sink.write,
+                metrics=metrics,
+                health=health,
+                parse_pool=parse_pool
+            )
+        finally:
+            sink.close()
+            if parse_pool is not None:
+                parse_pool.close()
         
-        logger.info(f"Total entries collected: {len(all_entries)}") 
\ No newline at end of file
+        # Persist the keys of the articles the store accepted
+        dedup_index.commit()
+        total = store.count()
+    
+    logger.info(f"New entries collected: {sink.new_entries} (store holds {total})")
+    for path in metrics_paths:
+        metrics.write(path)
+    
+    dead = health.dead_feeds(feeds)
+    if dead:
+        logger.warning(f"{len(dead)} feeds are dead or quarantined (see: python feed_health.py)")
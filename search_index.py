@@ -0,0 +1,124 @@
+import re
+import sqlite3
+from typing import Iterable, List, Optional, Tuple
+
+# Contentless FTS5 index over the articles table of the article store.
+# unicode61 folds case and (remove_diacritics 2) accents for every script.
+SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5(
+    title,
+    description,
+    content='',
+    tokenize='unicode61 remove_diacritics 2'
+);
+CREATE TABLE IF NOT EXISTS articles_fts_state (
+    id INTEGER PRIMARY KEY CHECK (id = 0),
+    last_rowid INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO articles_fts_state (id, last_rowid) VALUES (0, 0);
+"""
+
+# Relative weight of title and description matches in the ranking
+TITLE_WEIGHT = 3.0
+DESCRIPTION_WEIGHT = 1.0
+
+# Scripts written without spaces; each character is indexed as a token
+_UNSPACED_RE = re.compile(r'([぀-ヿ㐀-䶿一-鿿豈-﫿])')
+_QUERY_RE = re.compile(r'"([^"]*)"|(\S+)')
+_TOKEN_RE = re.compile(r'\w+')
+
+def segment(text: str) -> str:
+    """
+    Separate characters of unspaced scripts (Chinese, Japanese) so the
+    tokenizer indexes them individually and phrases can match within them.
+    """
+    return _UNSPACED_RE.sub(r' \1 ', text or '')
+
+def ensure_schema(conn: sqlite3.Connection) -> None:
+    conn.executescript(SCHEMA)
+
+def index_rows(conn: sqlite3.Connection, rows: Iterable[Tuple[int, str, str]]) -> None:
+    """
+    Add (rowid, title, description) rows of the articles table to the index.
+    Must be called inside the transaction that inserted them.
+    """
+    last_rowid = None
+    for rowid, title, description in rows:
+        conn.execute(
+            'INSERT INTO articles_fts (rowid, title, description) VALUES (?, ?, ?)',
+            (rowid, segment(title), segment(description))
+        )
+        last_rowid = rowid if last_rowid is None else max(last_rowid, rowid)
+    if last_rowid is not None:
+        conn.execute(
+            'UPDATE articles_fts_state SET last_rowid = MAX(last_rowid, ?) WHERE id = 0',
+            (last_rowid,)
+        )
+
+def catch_up(conn: sqlite3.Connection) -> int:
+    """
+    Index articles inserted before the index existed; returns how many.
+    """
+    last_rowid = conn.execute('SELECT last_rowid FROM articles_fts_state WHERE id = 0').fetchone()[0]
+    rows = conn.execute(
+        'SELECT rowid, title, description FROM articles WHERE rowid > ? ORDER BY rowid',
+        (last_rowid,)
+    ).fetchall()
+    if rows:
+        with conn:
+            index_rows(conn, rows)
+    return len(rows)
+
+def build_match_query(query: str) -> Optional[str]:
+    """
+    Translate a search box query into an FTS5 MATCH expression.
+
+    Supports bare terms (all must match), "quoted phrases" and prefix
+    terms ending in '*'. Everything is quoted, so FTS5 operators typed by
+    the user are treated as text.
+    """
+    parts = []
+    for phrase, word in _QUERY_RE.findall(query or ''):
+        prefix = bool(word) and word.endswith('*')
+        tokens = _TOKEN_RE.findall(segment(phrase or word))
+        if not tokens:
+            continue
+        expression = '"' + ' '.join(tokens) + '"'
+        parts.append(expression + '*' if prefix else expression)
+    return ' AND '.join(parts) if parts else None
+
+class SearchIndex:
+    """
+    Ranked full-text search over the article store.
+    """
+
+    def __init__(self, path: str):
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute('PRAGMA busy_timeout=5000')
+        ensure_schema(self.conn)
+        catch_up(self.conn)
+
+    def search(self, query: str, limit: Optional[int] = None) -> List[str]:
+        """
+        Article IDs matching ``query``, best match first.
+        """
+        match = build_match_query(query)
+        if match is None:
+            return []
+        sql = (
+            'SELECT a.article_id FROM articles_fts '
+            'JOIN articles a ON a.rowid = articles_fts.rowid '
+            'WHERE articles_fts MATCH ? '
+            f'ORDER BY bm25(articles_fts, {TITLE_WEIGHT}, {DESCRIPTION_WEIGHT})'
+        )
+        params: tuple = (match,)
+        if limit is not None:
+            sql += ' LIMIT ?'
+            params += (limit,)
+        try:
+            return [row[0] for row in self.conn.execute(sql, params)]
+        except sqlite3.OperationalError:
+            return []
+
+    def close(self) -> None:
+        self.conn.close()
@@ -0,0 +1,266 @@
+import csv
+import json
+import logging
+import os
+import threading
+import uuid
+from collections import defaultdict
+from contextlib import nullcontext, suppress
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import metrics
+from article import ARTICLE_COLUMNS, Article, from_epoch, to_columns
+from article_store import ArticleStore
+from dedup_index import DedupIndex
+
+logger = logging.getLogger(__name__)
+
+class ExportFile:
+    """
+    Append-only CSV or JSON-lines export file, written row by row.
+    """
+
+    def __init__(self, filename: str, output_format: str = 'csv'):
+        self.filename = filename
+        self.output_format = output_format
+        self.rows = 0
+        is_new = not os.path.exists(filename) or os.path.getsize(filename) == 0
+        self._file = open(filename, 'a', newline='', encoding='utf-8')
+        self._writer = None
+        if output_format == 'csv':
+            self._writer = csv.writer(self._file, lineterminator='\n')
+            if is_new:
+                self._writer.writerow(ARTICLE_COLUMNS)
+
+    def write(self, rows: Iterable[Article]) -> None:
+        for row in rows:
+            if self._writer is not None:
+                self._writer.writerow(row.as_tuple())
+            else:
+                self._file.write(json.dumps(row.as_row(), separators=(',', ':')) + '\n')
+            self.rows += 1
+
+    def close(self) -> None:
+        self._file.close()
+
+# Output formats written as a partitioned dataset rather than flat files
+DATASET_FORMATS = ('parquet',)
+
+# Columns encoded as the partition path rather than stored in the files
+PARTITION_COLUMNS = ('date', 'country')
+
+def parquet_schema():
+    """
+    Arrow schema of the Parquet dataset's files: the publication date as a
+    UTC timestamp and dictionary-encoded low-cardinality strings.
+    """
+    import pyarrow as pa
+
+    categorical = pa.dictionary(pa.int32(), pa.string())
+    return pa.schema([
+        ('title', pa.string()),
+        ('description', pa.string()),
+        ('url', pa.string()),
+        ('published_date', pa.timestamp('s')),
+        ('source', categorical),
+        ('language', categorical)
+    ])
+
+class ParquetExport:
+    """
+    Parquet dataset of articles, hive-partitioned by publication day and
+    country (``date=YYYY-MM-DD/country=X/part-*.parquet``).
+
+    Rows are buffered per partition and written as new, immutable part files
+    once ``rows_per_file`` rows are buffered and on ``flush``, so readers can
+    select partitions by path and columns by name without parsing text. The
+    partition columns are only encoded in the path.
+    """
+
+    def __init__(self, root: str, rows_per_file: int = 50000):
+        self.root = root
+        self.rows_per_file = rows_per_file
+        self.rows = 0
+        self.files = 0
+        self._pending: Dict[Tuple[str, str], List[Article]] = defaultdict(list)
+        self._pending_rows = 0
+        self._lock = threading.Lock()
+
+    def partition_dir(self, date_str: str, country: str) -> str:
+        values = (date_str, country or 'unknown')
+        return os.path.join(self.root, *(f"{column}={value}" for column, value in zip(PARTITION_COLUMNS, values)))
+
+    def write(self, rows: Iterable[Article]) -> None:
+        with self._lock:
+            for row in rows:
+                day = from_epoch(row.published).date().isoformat()
+                self._pending[(day, row.country)].append(row)
+                self._pending_rows += 1
+            if self._pending_rows >= self.rows_per_file:
+                self._flush()
+
+    def _flush(self) -> None:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        schema = parquet_schema()
+        failed: Dict[Tuple[str, str], List[Article]] = defaultdict(list)
+        for (day, country), rows in self._pending.items():
+            columns = to_columns(rows)
+            table = pa.table({
+                'title': columns['title'],
+                'description': columns['description'],
+                'url': columns['url'],
+                'published_date': pa.array(columns['published'], pa.timestamp('s')),
+                'source': pa.array(columns['source']).dictionary_encode(),
+                'language': pa.array(columns['language']).dictionary_encode()
+            }, schema=schema)
+            directory = self.partition_dir(day, country)
+            filename = os.path.join(directory, f"part-{uuid.uuid4().hex}.parquet")
+            tmp_path = f"{filename}.tmp"
+            try:
+                os.makedirs(directory, exist_ok=True)
+                # Only the low-cardinality columns benefit from dictionary pages
+                pq.write_table(table, tmp_path, compression='zstd', use_dictionary=['source', 'language'])
+                os.replace(tmp_path, filename)
+            except (OSError, pa.ArrowException) as e:
+                # Keep the rows for the next flush rather than losing them
+                logger.error(f"Error writing {filename}, keeping {len(rows)} rows pending: {str(e)}")
+                with suppress(OSError):
+                    os.remove(tmp_path)
+                failed[(day, country)] = rows
+                continue
+            self.rows += len(rows)
+            self.files += 1
+        self._pending = failed
+        self._pending_rows = sum(len(rows) for rows in failed.values())
+
+    def flush(self) -> None:
+        with self._lock:
+            if self._pending_rows:
+                self._flush()
+
+    def close(self) -> None:
+        self.flush()
+        if self._pending_rows:
+            logger.error(f"{self._pending_rows} rows could not be written to the Parquet dataset under {self.root}")
+        if self.files:
+            logger.info(f"Successfully saved {self.rows} entries to {self.files} Parquet files under {self.root}")
+
+class StoreSink:
+    """
+    Streaming sink for processed entries.
+
+    Entries are upserted into the article store in small batches as they
+    arrive; the newly stored ones are appended to the feed's daily export
+    and to the combined ``all_news`` export. Nothing is accumulated beyond
+    one batch, and ``write`` may be called from several worker threads.
+    Export files are named after the day the entries were written, so a
+    long-lived sink rolls over to new files at midnight. With a
+    ``dedup_index``, the articles of every batch the store accepted are
+    confirmed for its next ``commit``.
+
+    With ``output_format='parquet'`` the new entries go to one partitioned
+    Parquet dataset under ``data/parquet`` instead (see ``ParquetExport``).
+    """
+
+    def __init__(
+        self,
+        store: ArticleStore,
+        output_format: str = 'csv',
+        export: bool = True,
+        data_dir: str = 'data',
+        batch_size: int = 100,
+        dedup_index: Optional[DedupIndex] = None
+    ):
+        self.store = store
+        self.dedup_index = dedup_index
+        self.output_format = output_format
+        self.export = export
+        self.data_dir = data_dir
+        self.batch_size = batch_size
+        self.new_entries = 0
+        self._lock = threading.Lock()
+        self._combined: Optional[ExportFile] = None
+        self._dataset: Optional[ParquetExport] = None
+        if output_format in DATASET_FORMATS:
+            self._dataset = ParquetExport(os.path.join(data_dir, output_format))
+
+    def _export_combined(self, rows: List[Article], date_str: str) -> None:
+        filename = os.path.join(self.data_dir, f"all_news_{date_str}.{self.output_format}")
+        with self._lock:
+            if self._combined is not None and self._combined.filename != filename:
+                self._close_combined()
+            if self._combined is None:
+                self._combined = ExportFile(filename, self.output_format)
+            self._combined.write(rows)
+
+    def _close_combined(self) -> None:
+        self._combined.close()
+        logger.info(f"Successfully saved {self._combined.rows} entries to {self._combined.filename}")
+        self._combined = None
+
+    def write(self, feed_info: Dict[str, str], entries: Iterable[Article]) -> int:
+        """
+        Consume one feed's entries; returns how many were new.
+        """
+        feed_file: Optional[ExportFile] = None
+        written = 0
+        date_str = datetime.now().strftime('%Y%m%d')
+        feed_metrics = metrics.current()
+
+        def flush(batch: List[Article]) -> None:
+            nonlocal feed_file, written
+            with feed_metrics.timer('store') if feed_metrics is not None else nullcontext():
+                new_entries = self.store.upsert(batch)
+                if self.dedup_index is not None:
+                    self.dedup_index.confirm(batch)
+                written += len(new_entries)
+                if not new_entries or not self.export:
+                    return
+                if self._dataset is not None:
+                    self._dataset.write(new_entries)
+                    return
+                if feed_file is None:
+                    feed_file = ExportFile(
+                        os.path.join(
+                            self.data_dir,
+                            f"{feed_info['country']}_{feed_info['agency']}_{date_str}.{self.output_format}"
+                        ),
+                        self.output_format
+                    )
+                feed_file.write(new_entries)
+                self._export_combined(new_entries, date_str)
+
+        try:
+            batch = []
+            for entry in entries:
+                batch.append(entry)
+                if len(batch) >= self.batch_size:
+                    flush(batch)
+                    batch = []
+            if batch:
+                flush(batch)
+        finally:
+            if feed_file is not None:
+                feed_file.close()
+                logger.info(f"Successfully saved {feed_file.rows} entries to {feed_file.filename}")
+
+        with self._lock:
+            self.new_entries += written
+        return written
+
+    def flush(self) -> None:
+        """
+        Write out buffered dataset rows (file exports are written directly).
+        """
+        if self._dataset is not None:
+            self._dataset.flush()
+
+    def close(self) -> None:
+        if self._dataset is not None:
+            self._dataset.close()
+        with self._lock:
+            if self._combined is not None:
+                self._close_combined()
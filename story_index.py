@@ -0,0 +1,264 @@
+import random
+import re
+import sqlite3
+import zlib
+from array import array
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from article import to_epoch
+from search_index import segment
+
+# Bumped whenever the clustering changes; an index built by another version
+# is dropped and rebuilt from the articles table by ``catch_up``
+INDEX_VERSION = 2
+
+# Near-duplicate clustering of the articles table of the article store.
+# Every article gets a MinHash signature of the character shingles of its
+# title; the signature is cut into bands and each band is stored as a key, so
+# articles sharing a band (locality-sensitive hashing) are found with index
+# lookups instead of comparing against the whole store. Candidates are then
+# compared on the exact shingle similarity of their titles, the descriptions
+# only confirming borderline titles. ``story_id`` is the rowid of the first
+# article of the story.
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS article_stories (
+    article_rowid INTEGER PRIMARY KEY,
+    story_id INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_article_stories_story ON article_stories (story_id);
+CREATE TABLE IF NOT EXISTS story_bands (
+    band_key INTEGER NOT NULL,
+    published INTEGER NOT NULL,
+    article_rowid INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_story_bands_key ON story_bands (band_key, published);
+CREATE TABLE IF NOT EXISTS story_index_state (
+    id INTEGER PRIMARY KEY CHECK (id = 0),
+    last_rowid INTEGER NOT NULL,
+    version INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO story_index_state (id, last_rowid, version) VALUES (0, 0, {INDEX_VERSION});
+"""
+
+# Titles are compared as sets of overlapping character n-grams of their
+# normalised text: inflections ("staff"/"staffers") still share most of them,
+# and numbers ("May 21"/"May 22") count like any other characters.
+SHINGLE_SIZE = 4
+
+# Signature length and banding: BANDS * ROWS MinHash values. Titles whose
+# shingle sets have a Jaccard similarity of 0.25 share a band with
+# probability 1 - (1 - 0.25 ** ROWS) ** BANDS, about 0.87; at 0.05 about 0.08.
+BANDS = 32
+ROWS = 2
+NUM_PERM = BANDS * ROWS
+
+# Title similarity above which articles of different sources are the same
+# story. Measured on the corpus in data/: pairs above it are rewrites of one
+# event ("Two Israeli embassy staff killed in Washington shooting" and "2
+# staff members of Israeli Embassy killed in shooting near Jewish museum" are
+# 0.31), while the closest unrelated pairs, listicles of one template from
+# two sources, reach 0.17.
+SIMILARITY_THRESHOLD = 0.25
+
+# Borderline titles are the same story only if their descriptions are
+# near duplicates too (syndicated copy under a rewritten headline). A
+# description alone never joins articles: feeds repeat one blurb under
+# every item of a series.
+CONFIRM_THRESHOLD = 0.15
+DESCRIPTION_THRESHOLD = 0.5
+
+# Within one source the bar is higher: its recurring templated headlines
+# ("X v Y: what time is kick-off", "While You Were Sleeping, May 21") differ
+# only in a word or a number and score up to 0.88.
+SAME_SOURCE_THRESHOLD = 0.95
+
+# Articles this far apart in publication time are never the same story
+STORY_WINDOW = 3 * 24 * 60 * 60
+
+# Titles with fewer words are too short to cluster reliably
+MIN_TOKENS = 4
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_EMPTY = _MERSENNE_PRIME
+_rng = random.Random(20250522)
+_HASH_A = _rng.randrange(1, _MERSENNE_PRIME)
+_HASH_B = _rng.randrange(0, _MERSENNE_PRIME)
+# Bins an empty bin takes its value from, the first non-empty one in a fixed
+# random order per bin (the same for every title, so matching is preserved)
+_PROBES = [_rng.sample(range(NUM_PERM), NUM_PERM) for _ in range(NUM_PERM)]
+
+_TOKEN_RE = re.compile(r'\w+')
+
+def tokens(text: str) -> List[str]:
+    """
+    Normalised words of a text, numbers included; characters of unspaced
+    scripts are separate tokens.
+    """
+    return _TOKEN_RE.findall(segment(text or '').casefold())
+
+def shingles(text: str) -> Set[str]:
+    """
+    Distinct character n-grams of a text's normalised words.
+    """
+    normalized = ' '.join(tokens(text))
+    if len(normalized) <= SHINGLE_SIZE:
+        return {normalized} if normalized else set()
+    return {normalized[i:i + SHINGLE_SIZE] for i in range(len(normalized) - SHINGLE_SIZE + 1)}
+
+def similarity(first: Set[str], second: Set[str]) -> float:
+    """
+    Jaccard similarity of two shingle sets.
+    """
+    if not first or not second:
+        return 0.0
+    common = len(first & second)
+    return common / (len(first) + len(second) - common)
+
+def signature(title: str) -> Optional[array]:
+    """
+    MinHash signature of a title's shingles, or None if it is too short.
+
+    One-permutation hashing: each shingle is hashed once and kept as the
+    minimum of one of NUM_PERM bins, instead of being hashed NUM_PERM times;
+    bins no shingle fell into are filled from other bins (densification).
+    Two titles agree on a bin with probability equal to their similarity,
+    as with one hash function per bin.
+    """
+    if len(tokens(title)) < MIN_TOKENS:
+        return None
+    mins = [_EMPTY] * NUM_PERM
+    for shingle in shingles(title):
+        value = (_HASH_A * zlib.crc32(shingle.encode('utf-8')) + _HASH_B) % _MERSENNE_PRIME
+        index = value % NUM_PERM
+        if value < mins[index]:
+            mins[index] = value
+    return array('Q', (
+        value if value != _EMPTY else next(mins[probe] for probe in probes if mins[probe] != _EMPTY)
+        for value, probes in zip(mins, _PROBES)
+    ))
+
+def band_keys(sig: array) -> List[int]:
+    """
+    One signed 64-bit key per band (SQLite integer range).
+    """
+    keys = []
+    for band in range(BANDS):
+        values = sig[band * ROWS:(band + 1) * ROWS]
+        key = zlib.crc32(values.tobytes(), band) << 32 | zlib.crc32(values.tobytes(), band + BANDS)
+        keys.append(key - (1 << 64) if key >= 1 << 63 else key)
+    return keys
+
+def match_score(
+    title_shingles: Set[str],
+    other_title: str,
+    description: str,
+    other_description: str,
+    same_source: bool
+) -> float:
+    """
+    Title similarity of two articles if they cover the same story, else 0.
+    """
+    score = similarity(title_shingles, shingles(other_title))
+    if same_source:
+        return score if score >= SAME_SOURCE_THRESHOLD else 0.0
+    if score >= SIMILARITY_THRESHOLD:
+        return score
+    if score >= CONFIRM_THRESHOLD and similarity(shingles(description), shingles(other_description)) >= DESCRIPTION_THRESHOLD:
+        return score
+    return 0.0
+
+def ensure_schema(conn: sqlite3.Connection) -> None:
+    columns = [row[1] for row in conn.execute('PRAGMA table_info(story_index_state)')]
+    if columns:
+        row = conn.execute('SELECT version FROM story_index_state').fetchone() if 'version' in columns else None
+        if row is None or row[0] != INDEX_VERSION:
+            # Clustered by another version: start over, catch_up reassigns
+            # every article
+            conn.executescript(
+                'DROP TABLE IF EXISTS article_stories; '
+                'DROP TABLE IF EXISTS story_bands; '
+                'DROP TABLE story_index_state;'
+            )
+    conn.executescript(SCHEMA)
+
+def _find_story(
+    conn: sqlite3.Connection,
+    keys: List[int],
+    title: str,
+    description: str,
+    source: str,
+    published: int
+) -> Optional[int]:
+    placeholders = ','.join('?' * len(keys))
+    candidates = [row[0] for row in conn.execute(
+        f'SELECT DISTINCT article_rowid FROM story_bands WHERE band_key IN ({placeholders}) '
+        'AND published BETWEEN ? AND ?',
+        (*keys, published - STORY_WINDOW, published + STORY_WINDOW)
+    )]
+    if not candidates:
+        return None
+    title_shingles = shingles(title)
+    best_story, best_score = None, 0.0
+    placeholders = ','.join('?' * len(candidates))
+    for story_id, candidate_title, candidate_description, candidate_source in conn.execute(
+        'SELECT s.story_id, a.title, a.description, a.source FROM article_stories s '
+        'JOIN articles a ON a.rowid = s.article_rowid '
+        f'WHERE s.article_rowid IN ({placeholders})',
+        candidates
+    ):
+        score = match_score(title_shingles, candidate_title, description, candidate_description, candidate_source == source)
+        if score > best_score:
+            best_story, best_score = story_id, score
+    return best_story
+
+def assign_rows(conn: sqlite3.Connection, rows: Iterable[Tuple[int, str, str, str, int]]) -> Dict[int, int]:
+    """
+    Assign (rowid, title, description, source, published epoch) rows of the
+    articles table to stories. Must be called inside the transaction that inserted
+    them.
+
+    Returns:
+        Story ID of each rowid
+    """
+    assigned = {}
+    last_rowid = None
+    for rowid, title, description, source, published in rows:
+        sig = signature(title)
+        story_id = rowid
+        if sig is not None:
+            keys = band_keys(sig)
+            story_id = _find_story(conn, keys, title, description, source, published) or rowid
+            conn.executemany(
+                'INSERT INTO story_bands (band_key, published, article_rowid) VALUES (?, ?, ?)',
+                [(key, published, rowid) for key in keys]
+            )
+        conn.execute(
+            'INSERT OR REPLACE INTO article_stories (article_rowid, story_id) VALUES (?, ?)',
+            (rowid, story_id)
+        )
+        assigned[rowid] = story_id
+        last_rowid = rowid if last_rowid is None else max(last_rowid, rowid)
+    if last_rowid is not None:
+        conn.execute(
+            'UPDATE story_index_state SET last_rowid = MAX(last_rowid, ?) WHERE id = 0',
+            (last_rowid,)
+        )
+    return assigned
+
+def catch_up(conn: sqlite3.Connection) -> int:
+    """
+    Cluster articles inserted before the index existed; returns how many.
+    """
+    last_rowid = conn.execute('SELECT last_rowid FROM story_index_state WHERE id = 0').fetchone()[0]
+    rows = conn.execute(
+        'SELECT rowid, title, description, source, published_date FROM articles WHERE rowid > ? ORDER BY rowid',
+        (last_rowid,)
+    ).fetchall()
+    if rows:
+        with conn:
+            assign_rows(conn, (
+                (rowid, title, description, source, to_epoch(datetime.fromisoformat(published_date)))
+                for rowid, title, description, source, published_date in rows
+            ))
+    return len(rows)
@@ -1,8 +1,13 @@
+import math
+
 import streamlit as st
 import pandas as pd
-from datetime import datetime, timedelta
-import glob
-import os
+from datetime import timedelta
+
+from article_query import ArticleFilters, ArticleQuery
+from article_store import DEFAULT_STORE_PATH
+from dashboard_data import ExportImport, data_signature
+from rollups import Rollups
 
 # Set page config
 st.set_page_config(
@@ -11,61 +16,65 @@ st.set_page_config(
     layout="wide"
 )
 
+# Rows per page offered for the articles table
+PAGE_SIZES = [25, 50, 100, 200]
+
+# Sort options of the articles table: label -> (column, descending)
+SORT_OPTIONS = {
+    "Newest first": ('published_date', True),
+    "Oldest first": ('published_date', False),
+    "Title": ('title', False),
+    "Source": ('source', False),
+    "Country": ('country', False),
+    "Best match": ('relevance', True),
+}
+
+@st.cache_data(show_spinner="Loading articles...")
+def _sync_articles(signature):
+    """
+    Import new and changed export files into the article store; cached
+    until the files change.
+
+    Returns:
+        Number of articles in the store and error messages for unreadable files
+    """
+    return ExportImport().sync(signature)
+
+@st.cache_resource
+def _rollups():
+    """
+    Pre-aggregated article counts of the store, shared across reruns.
+    """
+    return Rollups(DEFAULT_STORE_PATH)
+
+@st.cache_resource
+def _article_query():
+    """
+    Filtered, paginated queries over the article store, shared across reruns.
+    """
+    return ArticleQuery(DEFAULT_STORE_PATH)
+
 def load_data():
     """
-    Load and combine all news data from CSV files.
+    Import the exported files into the article store; False if there is
+    nothing to show.
     """
-    # Get all CSV files in the data directory
-    csv_files = glob.glob('data/*.csv')
+    # Fingerprint of the per-feed export files in the data directory
+    signature = data_signature()
     
-    if not csv_files:
+    if not signature:
         st.error("No data files found in the data directory!")
-        return None
-    
-    # Read and combine all CSV files
-    dfs = []
-    for file in csv_files:
-        try:
-            df = pd.read_csv(file)
-            dfs.append(df)
-        except Exception as e:
-            st.warning(f"Error reading {file}: {str(e)}")
-    
-    if not dfs:
+        return False
+    
+    articles, errors = _sync_articles(signature)
+    for error in errors:
+        st.warning(error)
+    
+    if not articles:
         st.error("No valid data found!")
-        return None
-    
-    # Combine all dataframes
-    combined_df = pd.concat(dfs, ignore_index=True)
-    
-    # Convert published_date to datetime
-    try:
-        # First, ensure the column exists
-        if 'published_date' not in combined_df.columns:
-            st.error("No published_date column found in the data!")
-            return None
-            
-        # Convert to datetime, handling various formats
-        combined_df['published_date'] = pd.to_datetime(
-            combined_df['published_date'],
-            errors='coerce'
-        )
-        
-        # Remove rows with invalid dates
-        combined_df = combined_df.dropna(subset=['published_date'])
-        
-        if len(combined_df) == 0:
-            st.error("No valid dates found in the data!")
-            return None
-            
-    except Exception as e:
-        st.error(f"Error parsing dates: {str(e)}")
-        return None
-    
-    # Remove duplicates
-    combined_df = combined_df.drop_duplicates(subset=['title', 'url'])
-    
-    return combined_df
+        return False
+    
+    return True
 
 def main():
     """
@@ -74,15 +83,22 @@ def main():
     st.title("📰 Global News Dashboard")
     
     # Load data
-    df = load_data()
-    if df is None:
+    if not load_data():
+        return
+    
+    # Filter options, date bounds and charts come from the rollups, so they
+    # cost one row per bucket rather than one per article
+    rollups = _rollups()
+    bounds = rollups.date_bounds()
+    if bounds is None:
+        st.error("No articles in the store yet!")
         return
     
     # Sidebar filters
     st.sidebar.header("Filters")
     
     # Country filter
-    countries = sorted(df['country'].unique())
+    countries = rollups.values('country')
     selected_countries = st.sidebar.multiselect(
         "Select Countries",
         countries,
@@ -90,7 +106,7 @@ def main():
     )
     
     # Source filter
-    sources = sorted(df['source'].unique())
+    sources = rollups.values('source')
     selected_sources = st.sidebar.multiselect(
         "Select Sources",
         sources,
@@ -98,8 +114,7 @@ def main():
     )
     
     # Date range filter
-    min_date = df['published_date'].min().date()
-    max_date = df['published_date'].max().date()
+    min_date, max_date = bounds
     date_range = st.sidebar.date_input(
         "Select Date Range",
         value=(max_date - timedelta(days=7), max_date),
@@ -108,61 +123,106 @@ def main():
     )
     
     # Language filter
-    languages = sorted(df['language'].unique())
+    languages = rollups.values('language')
     selected_languages = st.sidebar.multiselect(
         "Select Languages",
         languages,
         default=languages
     )
     
-    # Apply filters
-    mask = (
-        df['country'].isin(selected_countries) &
-        df['source'].isin(selected_sources) &
-        df['language'].isin(selected_languages) &
-        (df['published_date'].dt.date >= date_range[0]) &
-        (df['published_date'].dt.date <= date_range[1])
+    start_date, end_date = date_range[0], date_range[-1]
+    filters = dict(
+        countries=selected_countries,
+        sources=selected_sources,
+        languages=selected_languages,
+        start=start_date,
+        end=end_date
+    )
+    
+    # Near-duplicate articles (same story from several feeds) shown once
+    group_stories = st.sidebar.checkbox(
+        "Group near-duplicate stories",
+        value=False,
+        help="Show each story once, with the number of articles covering it."
     )
-    filtered_df = df[mask]
     
     # Display statistics
     col1, col2 = st.columns(2)
     
     with col1:
         st.subheader("Articles by Country")
-        country_counts = filtered_df['country'].value_counts()
-        st.bar_chart(country_counts)
+        country_counts = dict(rollups.counts('country', **filters))
+        st.bar_chart(pd.Series(country_counts, name='count', dtype='int64'))
     
     with col2:
         st.subheader("Articles by Source")
-        source_counts = filtered_df['source'].value_counts()
-        st.bar_chart(source_counts)
-    
-    # Search functionality
-    search_query = st.text_input("🔍 Search articles", "")
-    if search_query:
-        search_mask = (
-            filtered_df['title'].str.contains(search_query, case=False, na=False) |
-            filtered_df['description'].str.contains(search_query, case=False, na=False)
-        )
-        filtered_df = filtered_df[search_mask]
-    
-    # Display articles table
-    st.subheader(f"Articles ({len(filtered_df)})")
-    
-    # Format the dataframe for display
-    display_df = filtered_df[['title', 'published_date', 'source', 'country', 'language']].copy()
-    display_df['published_date'] = display_df['published_date'].dt.strftime('%Y-%m-%d %H:%M')
+        source_counts = dict(rollups.counts('source', **filters))
+        st.bar_chart(pd.Series(source_counts, name='count', dtype='int64'))
+    
+    st.subheader("Articles over Time")
+    granularity = 'hour' if (end_date - start_date).days < 3 else 'day'
+    timeline = dict(rollups.counts('bucket', granularity=granularity, **filters))
+    st.line_chart(pd.Series(timeline, name='count', dtype='int64'))
+    
+    # Search functionality, ranked by the full-text index
+    search_query = st.text_input(
+        "🔍 Search articles",
+        "",
+        help='Words must all match; use "quoted phrases" and prefix* terms.'
+    )
     
-    # Add clickable links
-    display_df['link'] = filtered_df['url'].apply(
-        lambda x: f'<a href="{x}" target="_blank">Read Article</a>'
+    # Only the visible page is fetched from the store, filtered, sorted and
+    # paginated by SQLite
+    query = _article_query()
+    article_filters = ArticleFilters(**filters, search=search_query)
+    total = query.count(article_filters, group_stories=group_stories)
+    st.subheader(f"{'Stories' if group_stories else 'Articles'} ({total})")
+    
+    sort_col, size_col, page_col = st.columns([2, 1, 1])
+    with sort_col:
+        sort_labels = list(SORT_OPTIONS)
+        sort_label = st.selectbox(
+            "Sort by",
+            sort_labels,
+            index=sort_labels.index("Best match" if search_query else "Newest first")
+        )
+    with size_col:
+        page_size = st.selectbox("Rows per page", PAGE_SIZES, index=1)
+    with page_col:
+        pages = max(1, math.ceil(total / page_size))
+        page = st.number_input(f"Page (of {pages})", min_value=1, max_value=pages, value=1, step=1)
+    
+    sort, descending = SORT_OPTIONS[sort_label]
+    rows = query.page(
+        article_filters,
+        sort=sort,
+        descending=descending,
+        limit=page_size,
+        offset=(page - 1) * page_size,
+        group_stories=group_stories
     )
     
-    # Display the table with clickable links
-    st.write(
-        display_df.to_html(escape=False, index=False),
-        unsafe_allow_html=True
+    # Format the page for display
+    columns = ['title', 'published_date', 'source', 'country', 'language', 'url']
+    if group_stories:
+        columns.append('articles')
+    display_df = pd.DataFrame(rows, columns=columns)
+    display_df['published_date'] = pd.to_datetime(display_df['published_date'])
+    
+    # Links are rendered natively by the table
+    st.dataframe(
+        display_df,
+        hide_index=True,
+        use_container_width=True,
+        column_config={
+            'title': st.column_config.TextColumn("Title", width='large'),
+            'published_date': st.column_config.DatetimeColumn("Published", format='YYYY-MM-DD HH:mm'),
+            'source': "Source",
+            'country': "Country",
+            'language': "Language",
+            'url': st.column_config.LinkColumn("Link", display_text="Read Article"),
+            'articles': st.column_config.NumberColumn("Articles", help="Matching articles covering the story"),
+        }
     )
 
 if __name__ == "__main__":
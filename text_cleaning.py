@@ -0,0 +1,112 @@
+import html
+import re
+
+# Patterns shared by every call, compiled once
+_WHITESPACE_RE = re.compile(r'\s+')
+_SPECIAL_CHARS_RE = re.compile(r'[^\w\s.,!?-]')
+
+# A start or end tag whose attribute values may be quoted
+_TAG_RE = re.compile(
+    r'</?[A-Za-z][^<>"\']*(?:(?:"[^"<]*"|\'[^\'<]*\')(?=[\s/>])[^<>"\']*)*>'
+)
+
+# Elements whose text html.parser/BeautifulSoup treat specially
+_SPECIAL_ELEMENT_RE = re.compile(
+    r'<\s*/?\s*(?:script|style|template|rt|rp|pre|textarea)\b',
+    re.IGNORECASE
+)
+
+# Whitespace BeautifulSoup collapses when a text node consists only of it
+_ASCII_SPACES = '\x20\x0a\x09\x0c\x0d'
+
+# Entity references the lightweight path decodes with html.unescape
+_ENTITY_RE = re.compile(r'&(?:#[0-9]{1,7}|#[xX][0-9a-fA-F]{1,6}|[A-Za-z][A-Za-z0-9]{1,31});')
+# Any '&' that is not the start of an entity or followed by whitespace
+_BARE_AMPERSAND_RE = re.compile(r'&(?!\s|$)')
+
+
+def _entities_are_simple(text: str) -> bool:
+    """
+    Check that every '&' is a bare ampersand or an entity the lightweight
+    path decodes exactly like BeautifulSoup does.
+    """
+    for match in _BARE_AMPERSAND_RE.finditer(text):
+        entity = _ENTITY_RE.match(text, match.start())
+        if entity is None:
+            return False
+        name = entity.group()[1:-1]
+        if name[0] == '#':
+            codepoint = int(name[2:], 16) if name[1] in 'xX' else int(name[1:])
+            # NUL, C1 controls (cp1252 remapped), surrogates and out-of-range
+            # values are decoded differently by the two parsers
+            if (codepoint == 0 or 0x80 <= codepoint <= 0x9F
+                    or 0xD800 <= codepoint <= 0xDFFF or codepoint > 0x10FFFF):
+                return False
+        elif f"{name};" not in html.entities.html5:
+            return False
+    return True
+
+
+def _collapse_blank(segment: str) -> str:
+    """
+    Mirror BeautifulSoup, which reduces whitespace-only text nodes to a
+    single newline or space.
+    """
+    if segment and not segment.strip(_ASCII_SPACES):
+        return '\n' if '\n' in segment else ' '
+    return segment
+
+
+def _soup_text(text: str) -> str:
+    # Imported on first use: most feeds never need the fallback
+    from bs4 import BeautifulSoup
+
+    return BeautifulSoup(text, 'html.parser').get_text()
+
+
+def strip_markup(text: str) -> str:
+    """
+    Remove HTML tags and decode entities, equivalent to
+    ``BeautifulSoup(text, 'html.parser').get_text()``.
+
+    Plain text is returned untouched, typical RSS snippets (simple tags and
+    well-formed entities) are handled with regular expressions, and anything
+    else falls back to BeautifulSoup.
+    """
+    if '<' not in text and '&' not in text:
+        return _collapse_blank(text)
+
+    if '<' in text and _SPECIAL_ELEMENT_RE.search(text):
+        return _soup_text(text)
+
+    # Text segments between tags; entities never span a tag
+    segments = _TAG_RE.split(text) if '<' in text else [text]
+    for index, segment in enumerate(segments):
+        if '<' in segment:
+            return _soup_text(text)
+        if '&' in segment:
+            if not _entities_are_simple(segment):
+                return _soup_text(text)
+            segment = html.unescape(segment)
+        segments[index] = _collapse_blank(segment)
+
+    return ''.join(segments)
+
+
+def clean_text(text: str) -> str:
+    """
+    Clean and normalize text content.
+    """
+    if not text:
+        return ""
+
+    # Remove HTML tags
+    text = strip_markup(text)
+
+    # Remove extra whitespace
+    text = _WHITESPACE_RE.sub(' ', text)
+
+    # Remove special characters but keep basic punctuation
+    text = _SPECIAL_CHARS_RE.sub('', text)
+
+    return text.strip()
@@ -1,9 +1,12 @@
 import logging
-from datetime import datetime, timedelta
-from typing import Dict, Any, List
-import re
-from bs4 import BeautifulSoup
-import pandas as pd
+import os
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Any, Iterable, Iterator, List, Optional
+
+from article import Article
+from date_parsing import default_parser
+from text_cleaning import clean_text
 
 # Configure logging
 logging.basicConfig(
@@ -12,108 +15,90 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-def clean_text(text: str) -> str:
+def parse_date(date_str: str, feed: str = '') -> Optional[datetime]:
     """
-    Clean and normalize text content.
+    Parse various date formats to a timezone-naive UTC datetime object.
+    Returns None when the date cannot be parsed.
     """
-    if not text:
-        return ""
-    
-    # Remove HTML tags
-    soup = BeautifulSoup(text, 'html.parser')
-    text = soup.get_text()
-    
-    # Remove extra whitespace
-    text = re.sub(r'\s+', ' ', text)
-    
-    # Remove special characters but keep basic punctuation
-    text = re.sub(r'[^\w\s.,!?-]', '', text)
-    
-    return text.strip()
+    return default_parser.parse(date_str, feed)
 
-def parse_date(date_str: str) -> datetime:
+def timeframe_cutoff(days: int = 365, now: Optional[datetime] = None) -> datetime:
     """
-    Parse various date formats to datetime object.
-    Returns a timezone-naive datetime object.
+    Oldest naive UTC date inside the timeframe. Compute it once per batch of
+    entries rather than once per entry.
     """
-    if not date_str:
-        return datetime.now()
-        
-    try:
-        # Try parsing with pandas (handles most common formats)
-        dt = pd.to_datetime(date_str)
-        # Convert to naive datetime
-        if dt.tzinfo is not None:
-            dt = dt.tz_localize(None)
-        return dt
-    except:
-        try:
-            # Try parsing with datetime (ISO format with timezone)
-            dt = datetime.strptime(date_str, '%Y-%m-%dT%H:%M:%S%z')
-            return dt.replace(tzinfo=None)
-        except:
-            try:
-                # Try parsing without timezone
-                dt = datetime.strptime(date_str, '%Y-%m-%dT%H:%M:%S')
-                return dt
-            except:
-                try:
-                    # Try parsing just the date
-                    dt = datetime.strptime(date_str, '%Y-%m-%d')
-                    return dt
-                except:
-                    logger.warning(f"Could not parse date: {date_str}")
-                    return datetime.now()
+    now = now or datetime.now(timezone.utc)
+    if now.tzinfo is not None:
+        now = now.astimezone(timezone.utc).replace(tzinfo=None)
+    return now - timedelta(days=days)
 
-def is_within_timeframe(date: datetime, days: int = 365) -> bool:
+def is_within_timeframe(date: datetime, days: int = 365, cutoff_date: Optional[datetime] = None) -> bool:
     """
     Check if the date is within the specified timeframe.
     Handles offset-naive and offset-aware datetime comparison.
     """
-    cutoff_date = datetime.now()
-    # Convert both to naive UTC for comparison
+    if cutoff_date is None:
+        cutoff_date = timeframe_cutoff(days)
+    # Convert to naive UTC for comparison
     if date.tzinfo is not None:
-        date = date.replace(tzinfo=None)
-    if cutoff_date.tzinfo is not None:
-        cutoff_date = cutoff_date.replace(tzinfo=None)
-    cutoff_date = cutoff_date - timedelta(days=days)
+        date = date.astimezone(timezone.utc).replace(tzinfo=None)
     return date >= cutoff_date
 
-def deduplicate_entries(entries: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+def iter_unique_entries(
+    entries: Iterable[Article],
+    drops: Optional[Counter] = None
+) -> Iterator[Article]:
     """
-    Remove duplicate entries based on title and URL.
+    Lazily drop duplicate entries based on title and URL, counting them
+    under 'duplicate' in ``drops`` if given.
     """
     seen = set()
-    unique_entries = []
     
     for entry in entries:
         # Create a unique identifier using title and URL
-        identifier = f"{entry['title']}_{entry['url']}"
+        identifier = (entry.title, entry.url)
         
         if identifier not in seen:
             seen.add(identifier)
-            unique_entries.append(entry)
-    
-    return unique_entries
+            yield entry
+        elif drops is not None:
+            drops['duplicate'] += 1
 
-def save_to_csv(data: List[Dict[str, Any]], filename: str) -> None:
+def deduplicate_entries(entries: List[Article]) -> List[Article]:
+    """
+    Remove duplicate entries based on title and URL.
     """
-    Save data to CSV file.
+    return list(iter_unique_entries(entries))
+
+def save_to_csv(data: List[Dict[str, Any]], filename: str, append: bool = False) -> None:
     """
+    Save data to CSV file, optionally appending to an existing one.
+    """
+    import pandas as pd
+
     try:
         df = pd.DataFrame(data)
-        df.to_csv(filename, index=False, encoding='utf-8')
+        if append and os.path.exists(filename):
+            df.to_csv(filename, mode='a', header=False, index=False, encoding='utf-8')
+        else:
+            df.to_csv(filename, index=False, encoding='utf-8')
         logger.info(f"Successfully saved data to {filename}")
     except Exception as e:
         logger.error(f"Error saving data to {filename}: {str(e)}")
 
-def save_to_json(data: List[Dict[str, Any]], filename: str) -> None:
+def save_to_json(data: List[Dict[str, Any]], filename: str, append: bool = False) -> None:
     """
-    Save data to JSON file.
+    Save data to JSON lines file, optionally appending to an existing one.
     """
+    import pandas as pd
+
     try:
         df = pd.DataFrame(data)
-        df.to_json(filename, orient='records', lines=True)
+        if append and os.path.exists(filename):
+            with open(filename, 'a', encoding='utf-8') as f:
+                df.to_json(f, orient='records', lines=True)
+        else:
+            df.to_json(filename, orient='records', lines=True)
         logger.info(f"Successfully saved data to {filename}")
     except Exception as e:
         logger.error(f"Error saving data to {filename}: {str(e)}") 
\ No newline at end of file